@@ -0,0 +1,141 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+from transport import RETRY_STATUSES
+
+
+def backoff_delay(attempt, retry_after=None, base=0.5, cap=30):
+    """Jittered exponential backoff, overridden by a numeric Retry-After header."""
+    if retry_after and retry_after.isdigit():
+        return min(int(retry_after), cap)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit driven by latency and throttling responses."""
+
+    def __init__(self, initial=10, minimum=2, maximum=64, target_latency=1.5):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency, status):
+        async with self._cond:
+            self.in_flight -= 1
+            if status == 429 or status >= 500:
+                # Back off hard on throttling / server errors
+                self.limit = max(self.minimum, self.limit / 2)
+            elif latency > self.target_latency:
+                self.limit = max(self.minimum, self.limit * 0.9)
+            else:
+                # Additive increase, spread over a full window of requests
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class AsyncCrawler:
+    """Fetch listing pages for a Scraper on one asyncio event loop.
+
+    Only network I/O runs on the loop, so the latencies fed to the limiter are
+    not inflated by parsing or cache writes, which run on worker threads.
+    Connection failures and the statuses the blocking session retries
+    (``RETRY_STATUSES``) are retried; any other status, such as a 404, is final.
+    """
+
+    def __init__(self, scraper, initial=10, maximum=64, timeout=30):
+        self.scraper = scraper
+        self.initial = initial
+        self.maximum = maximum
+        self.timeout = timeout
+
+    async def fetch(self, http, limiter, page, retries=3):
+        url = f"{self.scraper.base_url}{page}/"
+        # Share the on-disk cache with the blocking session, if it has one
+        loop = asyncio.get_running_loop()
+        cache = getattr(self.scraper.session, "cache", None)
+        entry = await loop.run_in_executor(None, cache.lookup, url) if cache else None
+        if entry is not None and (self.scraper.session.offline or cache.is_fresh(entry)):
+            cache.touch(url)
+            self.scraper.metrics.observe_cache_hit()
+            return page, entry[0]
+        if cache and self.scraper.session.offline:
+            print(f"[Async] Offline replay: page {page} is not cached")
+            return page, None
+        headers = cache.conditional_headers(entry) if entry else {}
+
+        breaker = self.scraper.breaker
+        metrics = self.scraper.metrics
+        for attempt in range(retries + 1):
+            await asyncio.sleep(breaker.remaining_pause())
+            await limiter.acquire()
+            start = time.monotonic()
+            status = 0
+            retry_after = None
+            revalidated = False
+            try:
+                async with http.get(url, headers=headers) as response:
+                    status = response.status
+                    retry_after = response.headers.get("Retry-After")
+                    response_headers = response.headers
+                    body = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = 599
+                body = None
+                metrics.record_error(type(e).__name__)
+                print(f"[Async] Error on page {page}: {e}")
+            finally:
+                latency = time.monotonic() - start
+                await limiter.release(latency, status)
+            if status == 304 and entry is not None:
+                cache.touch(url, revalidated=True)
+                status, body, revalidated = 200, entry[0], True
+            elif status == 200 and cache:
+                await loop.run_in_executor(None, cache.store, url, body, response_headers)
+            breaker.record(status == 200)
+            if status == 200:
+                if revalidated:
+                    metrics.observe_cache_hit()
+                else:
+                    metrics.observe_request(latency, len(body))
+                return page, body
+            if status != 599:
+                metrics.record_error(f"HTTP {status}")
+            if status != 599 and status not in RETRY_STATUSES:
+                break
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+        print(f"[Async] Giving up on page {page} (last status {status})")
+        return page, None
+
+    async def crawl(self, pages):
+        limiter = AdaptiveLimiter(initial=self.initial, maximum=self.maximum)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.maximum)
+        headers = dict(self.scraper.session.headers)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector, headers=headers) as http:
+            tasks = [asyncio.create_task(self.fetch(http, limiter, page)) for page in pages]
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        print(f"[Async] Final concurrency limit: {limiter.limit:.1f}")
+
+    def run(self, pages, on_page):
+        """Crawl ``pages`` and call ``on_page(page, body)`` as each one completes."""
+        async def _drive():
+            loop = asyncio.get_running_loop()
+            # One thread keeps on_page calls serial, as they update shared results
+            with ThreadPoolExecutor(max_workers=1) as parser:
+                async for page, body in self.crawl(pages):
+                    await loop.run_in_executor(parser, on_page, page, body)
+
+        asyncio.run(_drive())
@@ -0,0 +1,200 @@
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import zip_longest
+
+from tqdm import tqdm
+
+from crawl_journal import CrawlJournal
+from crawl_metrics import CrawlMetrics
+from link_index import LinkIndex
+from link_writers import WRITERS
+from listing_parsers import BACKENDS
+from scrap_anything_examtopics import Scraper, build_session, write_grouped_links_to_excels
+from transport import CircuitBreaker, HostRateLimiter
+
+# Example catalogue file:
+# {
+#     "providers": {
+#         "google": ["PROFESSIONAL-DATA-ENGINEER", "ASSOCIATE-CLOUD-ENGINEER"],
+#         "microsoft": ["AZ-104", "AZ-305"],
+#         "hashicorp": ["TERRAFORM-ASSOCIATE"]
+#     },
+#     "concurrency": 16,
+#     "rate": 8,
+#     "format": "csv",
+#     "out_dir": "links"
+# }
+
+
+def load_catalogue(args):
+    """Merge the config file (if any) with --provider NAME[=CODE,CODE] arguments."""
+    config = {}
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+    providers = {name.lower(): list(codes) for name, codes in config.get("providers", {}).items()}
+    for spec in args.provider or []:
+        name, _, codes = spec.partition("=")
+        providers[name.strip().lower()] = [code for code in codes.split(",") if code.strip()]
+    for key in ("concurrency", "rate", "format", "out_dir"):
+        if getattr(args, key) is None:
+            setattr(args, key, config.get(key))
+    return providers
+
+
+def interleave(page_lists):
+    """Round-robin (provider, page) tasks so every provider progresses at the same pace."""
+    for row in zip_longest(*page_lists):
+        for task in row:
+            if task is not None:
+                yield task
+
+
+class BatchCrawler:
+    """Crawl many providers' listing pages on one shared, rate-limited worker pool."""
+
+    def __init__(self, providers, concurrency=16, rate=8.0, cache_dir=None, resume=False,
+                 journal_dir=".examtopics_journal", retry_rounds=2, parser="auto", cache_fresh_for=0):
+        self.concurrency = concurrency
+        self.retry_rounds = retry_rounds
+        self.rate_limiter = HostRateLimiter(rate)
+        self.breaker = CircuitBreaker()
+        self.metrics = CrawlMetrics()
+        # Every provider shares one pooled session, breaker and per-host token bucket
+        self.session = build_session(cache_dir, concurrency=concurrency, cache_fresh_for=cache_fresh_for)
+        self.jobs = []
+        for provider, codes in providers.items():
+            scraper = Scraper(provider, concurrency=concurrency, parser=parser, session=self.session)
+            scraper.breaker = self.breaker
+            scraper.rate_limiter = self.rate_limiter
+            scraper.metrics = self.metrics
+            search_string = ",".join(code.upper() for code in codes)
+            journal = CrawlJournal(os.path.join(journal_dir, f"{scraper.provider}.jsonl"),
+                                   scraper.provider, search_string, resume=resume)
+            self.jobs.append({"scraper": scraper, "search": search_string, "journal": journal, "sinks": {},
+                              "pages": [], "no_page_count": False})
+
+    def _run_pool(self, fn, tasks, desc):
+        results = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(fn, *task): task for task in tasks}
+            with tqdm(total=len(futures), desc=desc, unit="page") as pbar:
+                for future in as_completed(futures):
+                    results.append((futures[future], future.result()))
+                    pbar.update(1)
+        return results
+
+    def crawl(self):
+        self.metrics.start()
+        # Page counts first, on the same pool
+        for (job,), num_pages in self._run_pool(lambda job: job["scraper"].get_num_pages(),
+                                                [(job,) for job in self.jobs], "Page counts"):
+            if not num_pages:
+                # Crawling nothing would look like an empty catalogue; keep the journal and fail the run instead
+                print(f"[Batch] {job['scraper'].provider}: could not read the page count; skipping it.")
+                job["no_page_count"] = True
+                continue
+            job["pages"] = job["scraper"].pages_to_fetch(num_pages, job["search"], [], job["sinks"], job["journal"])
+
+        def fetch(job, page):
+            return job["scraper"].fetch_page_links(page, job["search"], job["sinks"])
+
+        pending = [[(job, page) for page in job["pages"]] for job in self.jobs]
+        for attempt in range(self.retry_rounds + 1):
+            tasks = list(interleave(pending))
+            if not tasks:
+                break
+            if attempt:
+                print(f"[Batch] Retry round {attempt}: {len(tasks)} failed pages.")
+            for job in self.jobs:
+                job["scraper"].failed_pages = []
+            for (job, page), page_links in self._run_pool(fetch, tasks, "Listing pages"):
+                if page_links is not None:
+                    job["journal"].record_page(page, page_links)
+            pending = [[(job, page) for page in sorted(job["scraper"].failed_pages)] for job in self.jobs]
+
+        for job in self.jobs:
+            job["journal"].close()
+        return self.jobs
+
+    def export(self, fmt="xlsx", out_dir=".", index_db=None):
+        """Write every crawled provider's files; returns the providers whose crawl is incomplete."""
+        os.makedirs(out_dir, exist_ok=True)
+        index = LinkIndex(index_db) if index_db else None
+        incomplete = []
+        for job in self.jobs:
+            scraper = job["scraper"]
+            if job["no_page_count"]:
+                incomplete.append(scraper.provider)
+                continue
+            print(f"[Batch] {scraper.provider}: {sum(len(v) for v in job['sinks'].values())} links.")
+            write_grouped_links_to_excels(job["sinks"], fmt=fmt, out_dir=out_dir)
+            if index is not None:
+                for sink_links in job["sinks"].values():
+                    index.add_links(scraper.provider, sink_links)
+            if scraper.failed_pages:
+                print(f"[Batch] {scraper.provider}: {len(scraper.failed_pages)} pages failed; rerun with --resume.")
+                incomplete.append(scraper.provider)
+            else:
+                job["journal"].finish()
+        if index is not None:
+            index.close()
+        return incomplete
+
+    def close(self):
+        self.session.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Unattended multi-provider ExamTopics link crawl")
+    parser.add_argument("--config", help="JSON catalogue of providers and exam codes")
+    parser.add_argument("--provider", action="append",
+                        help="NAME or NAME=CODE,CODE (repeatable), e.g. microsoft=AZ-104,AZ-305")
+    parser.add_argument("--concurrency", type=int, help="Shared worker pool size (default 16)")
+    parser.add_argument("--rate", type=float, help="Requests per second per host (default 8)")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="Per-exam output file format (default xlsx)")
+    parser.add_argument("--out-dir", dest="out_dir", help="Directory for the per-exam files (default .)")
+    parser.add_argument("--parser", choices=["auto"] + sorted(BACKENDS), default="auto",
+                        help="Listing page HTML extraction backend")
+    parser.add_argument("--cache-dir", default=".examtopics_cache", help="On-disk HTTP cache ('' to disable)")
+    parser.add_argument("--cache-fresh-for", type=int, default=0,
+                        help="Serve cached pages younger than this many seconds without revalidating (default 0)")
+    parser.add_argument("--journal-dir", default=".examtopics_journal", help="Where crawl journals are kept")
+    parser.add_argument("--index-db", default="examtopics_links.sqlite", help="SQLite index of known discussion links")
+    parser.add_argument("--metrics-json", help="Write a JSON crawl metrics summary to this file")
+    parser.add_argument("--metrics-prom", help="Write Prometheus text-format crawl metrics to this file")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="DEBUG prints every link found, INFO prints per-page counts")
+    parser.add_argument("--resume", action="store_true", help="Skip pages completed by an interrupted crawl")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(message)s")
+    providers = load_catalogue(args)
+    if not providers:
+        print("[Batch] No providers given; use --config or --provider.")
+        return
+    print(f"[Batch] Crawling {len(providers)} providers: {', '.join(providers)}")
+    crawler = BatchCrawler(providers, concurrency=args.concurrency or 16, rate=args.rate or 8.0,
+                           cache_dir=args.cache_dir, resume=args.resume, journal_dir=args.journal_dir,
+                           parser=args.parser, cache_fresh_for=args.cache_fresh_for)
+    try:
+        crawler.crawl()
+        crawler.metrics.report(args.metrics_json, args.metrics_prom)
+        incomplete = crawler.export(fmt=args.format or "xlsx", out_dir=args.out_dir or ".", index_db=args.index_db)
+    finally:
+        crawler.close()
+    if incomplete:
+        print(f"[Batch] Catalogue refresh incomplete for: {', '.join(incomplete)}.")
+        sys.exit(1)
+    print("[Batch] Catalogue refresh complete. ✅")
+
+
+if __name__ == "__main__":
+    main()
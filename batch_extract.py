@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tqdm import tqdm
+
+import scrap_from_csv_make_json_word as extractor
+from dedup import dedup_urls
+from question_store import QuestionStore
+from static_extractor import build_static_session
+from transport import HostRateLimiter
+
+# Manifest format (exam_manifest.json):
+# {
+#     "concurrency": 8,
+#     "rate": 4,
+#     "browsers": 4,
+#     "exams": [
+#         {"csv": "az-104.csv", "exam_id": "azure-administrator-associate", "name": "Azure Administrator Associate"}
+#     ]
+# }
+# Outputs default to "<name>.json", "<name>.jsonl" and "<name>.docx"; an exam entry
+# may override them with "json", "jsonl" and "docx" keys.
+
+
+def load_manifest(path, only=None):
+    """Read the manifest; returns (settings, exams), keeping only the exam ids in ``only`` if given."""
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    exams = manifest.get("exams", [])
+    if only:
+        exams = [exam for exam in exams if exam["exam_id"] in only]
+    settings = {key: manifest.get(key) for key in ("concurrency", "rate", "browsers")}
+    return settings, exams
+
+
+def exam_outputs(exam, out_dir="."):
+    name = exam["name"]
+    return {
+        "json_path": os.path.join(out_dir, exam.get("json", f"{name}.json")),
+        "jsonl_path": os.path.join(out_dir, exam.get("jsonl", f"{name}.jsonl")),
+        "doc_path": os.path.join(out_dir, exam.get("docx", f"{name}.docx")),
+        "title": exam.get("title", f"{name} Actual Exam Questions"),
+    }
+
+
+class BatchExtractor:
+    """Scrape every exam in a manifest on one shared, rate-limited worker pool.
+
+    Exams are scheduled largest first so the long jobs start immediately and
+    the small ones fill in the tail. Each exam is exported as soon as its last
+    page is in the store; pages the static parser can't handle are batched onto
+    one pool of headless browsers at the end.
+    """
+
+    def __init__(self, exams, store, concurrency=8, rate=4.0, browsers=extractor.DRIVER_POOL_SIZE, out_dir="."):
+        self.store = store
+        self.concurrency = concurrency
+        self.browsers = browsers
+        self.out_dir = out_dir
+        self.rate_limiter = HostRateLimiter(rate)
+        self.session = build_static_session(pool_size=concurrency)
+        self.jobs = []
+        for exam in exams:
+            urls = dedup_urls(extractor.read_urls(exam["csv"]))
+            todo = store.pending(urls)
+            self.jobs.append({"exam": exam, "urls": urls, "todo": todo, "remaining": len(todo), "fallback": []})
+        # Largest outstanding exam first
+        self.jobs.sort(key=lambda job: len(job["todo"]), reverse=True)
+
+    def _fetch(self, job, idx, url):
+        self.rate_limiter.acquire(url)
+        fields = extractor.extract_question_fields_static(self.session, url, idx, job["exam"]["exam_id"])
+        if fields:
+            self.store.save_fields(url, job["exam"]["exam_id"], fields)
+        return fields
+
+    def _export(self, job):
+        exam = job["exam"]
+        count = extractor.export_from_store(self.store, job["urls"], exam["exam_id"], **exam_outputs(exam, self.out_dir))
+        print(f"[Extract] {exam['name']}: {count} questions exported ({self.store.status_counts(exam['exam_id'])}).")
+
+    def run(self):
+        tasks = [(job, idx, url) for job in self.jobs for idx, url in enumerate(job["todo"], start=2)]
+        for job in self.jobs:
+            print(f"[Extract] {job['exam']['name']}: {len(job['urls']) - len(job['todo'])} stored, "
+                  f"{len(job['todo'])} to scrape.")
+
+        # Jobs with nothing to scrape can be exported straight away
+        for job in self.jobs:
+            if not job["remaining"]:
+                self._export(job)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(self._fetch, *task): task for task in tasks}
+            with tqdm(total=len(futures), desc="Question pages", unit="page") as pbar:
+                for future in as_completed(futures):
+                    job, idx, url = futures[future]
+                    if not future.result():
+                        job["fallback"].append((idx, url, job["exam"]["exam_id"]))
+                    job["remaining"] -= 1
+                    if not job["remaining"] and not job["fallback"]:
+                        self._export(job)
+                    pbar.update(1)
+
+        fallback_jobs = [job for job in self.jobs if job["fallback"]]
+        items = [item for job in fallback_jobs for item in sorted(job["fallback"])]
+        extractor.scrape_in_browsers(self.store, items, size=self.browsers)
+        for job in fallback_jobs:
+            self._export(job)
+        extractor.deduper.save()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape, store and export every exam in a manifest")
+    parser.add_argument("--manifest", default="exam_manifest.json", help="JSON manifest of CSV files and exam ids")
+    parser.add_argument("--exam", action="append", help="Only process this exam id (repeatable)")
+    parser.add_argument("--concurrency", type=int, help="Shared worker pool size (default 8)")
+    parser.add_argument("--rate", type=float, help="Requests per second per host (default 4)")
+    parser.add_argument("--browsers", type=int, help="Headless browsers for the fallback pass (default 4)")
+    parser.add_argument("--store", default=extractor.STORE_PATH, help="SQLite question store")
+    parser.add_argument("--out-dir", default=".", help="Directory for the JSON and Word outputs")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    settings, exams = load_manifest(args.manifest, args.exam)
+    if not exams:
+        print("[Extract] No exams to process.")
+        return
+    os.makedirs(args.out_dir, exist_ok=True)
+    store = QuestionStore(args.store)
+    print(f"[Extract] Processing {len(exams)} exams from {args.manifest}.")
+    batch = BatchExtractor(
+        exams, store,
+        concurrency=args.concurrency or settings["concurrency"] or 8,
+        rate=args.rate or settings["rate"] or 4.0,
+        browsers=args.browsers or settings["browsers"] or extractor.DRIVER_POOL_SIZE,
+        out_dir=args.out_dir,
+    )
+    batch.run()
+    store.close()
+    print("[Extract] All exams exported. ✅")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import glob
+import os
+import time
+import zlib
+
+from listing_parsers import BACKENDS, get_listing_parser
+
+# Markup that naive tag scanners get wrong; every backend must agree with bs4 on these
+EDGE_CASES = [
+    b'<!-- <a class="discussion-link" href="/discussions/x/view/1-commented-out/">old</a> -->'
+    b'<a class="discussion-link" href="/discussions/x/view/2-live/">live</a>',
+    b'<a title="a > b" class="discussion-link" href="/discussions/x/view/3-gt-in-title/">gt</a>',
+    b'<a data-note=\'x>y\' href="/discussions/x/view/4-gt-before-href/" class="discussion-link">gt</a>',
+    b'<a class="discussion-link" data-href="/wrong/" href="/discussions/x/view/5-data-href/">data</a>',
+    b'<a class="discussion-links" href="/discussions/x/view/6-other-class/">no</a>'
+    b'<a class=discussion-link href=/discussions/x/view/7-unquoted/>bare</a>',
+    b'<A CLASS="item discussion-link" HREF="/discussions/x/view/8-upper?a=1&amp;b=2">upper</A>',
+]
+
+
+def load_pages(path):
+    """Load saved listing pages: *.html files, or the zlib bodies in an HTTP cache directory."""
+    pages = []
+    for file_name in sorted(glob.glob(os.path.join(path, "*.html")) + glob.glob(os.path.join(path, "*.htm"))):
+        with open(file_name, "rb") as f:
+            pages.append(f.read())
+    for file_name in sorted(glob.glob(os.path.join(path, "*.z"))):
+        with open(file_name, "rb") as f:
+            pages.append(zlib.decompress(f.read()))
+    return pages
+
+
+def bench(parser, pages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            parser.links(page)
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark listing page parser backends on saved pages")
+    arg_parser.add_argument("pages", help="Directory of saved .html pages or an HTTP cache directory")
+    arg_parser.add_argument("--rounds", type=int, default=5, help="Passes over the page set per backend")
+    args = arg_parser.parse_args()
+
+    pages = load_pages(args.pages)
+    if not pages:
+        print(f"[Bench] No saved pages found in {args.pages}")
+        return
+    total_mb = sum(len(page) for page in pages) / 1e6
+    print(f"[Bench] {len(pages)} pages, {total_mb:.1f} MB, {args.rounds} rounds")
+
+    reference = get_listing_parser("bs4")
+    expected = [reference.links(page) for page in pages]
+    baseline = None
+    for name in BACKENDS:
+        try:
+            parser = get_listing_parser(name)
+        except ImportError as e:
+            print(f"[Bench] {name:>6}: unavailable ({e})")
+            continue
+        mismatches = sum(parser.links(page) != links for page, links in zip(pages, expected))
+        edge_mismatches = sum(parser.links(page) != reference.links(page) for page in EDGE_CASES)
+        elapsed = bench(parser, pages, args.rounds)
+        baseline = baseline or elapsed
+        pages_per_sec = len(pages) * args.rounds / elapsed
+        print(f"[Bench] {name:>6}: {pages_per_sec:8.1f} pages/s  {baseline / elapsed:5.1f}x vs bs4  "
+              f"mismatches: {mismatches}  edge case mismatches: {edge_mismatches}/{len(EDGE_CASES)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+from docx import Document
+from docx.oxml.ns import qn
+
+from sort_word_file import QUESTION_PATTERN, create_sorted_document, create_sorted_document_xml, extract_questions
+
+
+def question_texts(path):
+    """Paragraph texts from the first question heading on, to compare the two sort modes."""
+    texts = [para.text for para in Document(path).paragraphs]
+    for i, text in enumerate(texts):
+        if QUESTION_PATTERN.match(text.strip()):
+            return texts[i:]
+    return []
+
+
+def drawings(path):
+    return sum(1 for _ in Document(path).element.body.iter(qn('w:drawing')))
+
+
+def sort_copy(input_path, output_path):
+    create_sorted_document(extract_questions(input_path), output_path)
+
+
+MODES = {
+    "copy": sort_copy,
+    "xml": create_sorted_document_xml,
+}
+
+
+def bench(sort, input_path, output_path, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        sort(input_path, output_path)
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sort_word_file's copy and XML sort modes")
+    parser.add_argument("docs", nargs="*", help="Word documents (default: every *.docx here)")
+    parser.add_argument("--rounds", type=int, default=3, help="Sorts per document and mode")
+    args = parser.parse_args()
+
+    docs = args.docs or sorted(glob.glob("*.docx"))
+    totals = dict.fromkeys(MODES, 0.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in docs:
+            outputs = {mode: os.path.join(tmp, f"{mode}.docx") for mode in MODES}
+            timings = {mode: bench(sort, path, outputs[mode], args.rounds) for mode, sort in MODES.items()}
+            for mode, elapsed in timings.items():
+                totals[mode] += elapsed
+            same = question_texts(outputs["copy"]) == question_texts(outputs["xml"])
+            print(f"[Bench] {os.path.basename(path)[:40]:<40} copy {timings['copy']:6.2f}s  "
+                  f"xml {timings['xml']:6.2f}s  {timings['copy'] / timings['xml']:5.1f}x  "
+                  f"text match: {same}  drawings {drawings(path)} -> copy {drawings(outputs['copy'])}, "
+                  f"xml {drawings(outputs['xml'])}")
+    if docs:
+        print(f"[Bench] Total: copy {totals['copy']:.2f}s, xml {totals['xml']:.2f}s "
+              f"({totals['copy'] / totals['xml']:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
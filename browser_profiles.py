@@ -0,0 +1,57 @@
+import itertools
+import os
+import threading
+
+# Requests the scrapers never read: images, fonts, ads and third-party trackers
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm",
+    "*googlesyndication.com*", "*doubleclick.net*", "*googleadservices.com*", "*adservice.google.*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*googletagservices.com*",
+    "*amazon-adsystem.com*", "*adnxs.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*",
+    "*facebook.net*", "*connect.facebook.*", "*hotjar.com*", "*quantserve.com*", "*scorecardresearch.com*",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+]
+
+DEFAULT_PROFILE_DIR = os.path.abspath(".browser_profile")
+
+_worker_profiles = threading.local()
+_profile_ids = itertools.count()
+
+
+def worker_profile_dir(base=DEFAULT_PROFILE_DIR):
+    """A profile directory owned by the calling thread, so recycled drivers reuse their cache."""
+    if not hasattr(_worker_profiles, "path"):
+        _worker_profiles.path = os.path.join(base, f"worker-{next(_profile_ids)}")
+    return _worker_profiles.path
+
+
+def apply_lean_options(options, profile_dir=None):
+    """Configure Chrome/Edge options for fast, text-only page loads.
+
+    Images are disabled, the driver returns at DOMContentLoaded ("eager"), and
+    an optional persistent profile keeps the HTTP cache warm across runs.
+    """
+    options.page_load_strategy = "eager"
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    return options
+
+
+def enable_request_blocking(driver, patterns=None):
+    """Block ads, trackers, fonts and images over the DevTools protocol."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns or BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        print(f"[Lean Profile] Request blocking unavailable: {e}")
+    return driver
@@ -5,20 +5,38 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from docx import Document
+from selenium.common.exceptions import TimeoutException
+from browser_profiles import apply_lean_options, enable_request_blocking
+from html_archive import HtmlArchive
+from jsonl_writer import JsonlWriter, jsonl_to_json
+from question_records import build_question_json, correct_option_letters, heading_numbers, question_heading
+from question_urls import build_url_index
+from render_docx import render_with_xml_template
 import time
 
+LEAN_PROFILE = True  # block images/fonts/ads, eager page loads, persistent profile cache
+
 # Setup Chrome
 options = Options()
 options.add_argument("--disable-blink-features=AutomationControlled")
+if LEAN_PROFILE:
+    apply_lean_options(options, profile_dir=".browser_profile/chrome")
 service = Service("C:\\Users\\Rajkumar\\Downloads\\chromedriver-win64\\chromedriver-win64\\chromedriver.exe")  # Update this path
 driver = webdriver.Chrome(service=service, options=options)
+if LEAN_PROFILE:
+    enable_request_blocking(driver)
 
-# Word document
-doc = Document()
-doc.add_heading('Professional Cloud DevOps Engineer Actual Exam Questions', 0)
+# (exam, topic, question) -> discussion URL from the crawled link CSVs
+EXAM_SLUG = "professional-cloud-devops-engineer"
+url_index = build_url_index()
+archive = HtmlArchive(".question_archive")  # raw pages, for offline re-extraction with reparse.py
 
-for i in range(170, 203):
+# Questions are streamed to JSON Lines; the Word document is rendered from the records at the end
+questions_jsonl = JsonlWriter("Cloud_DevOps_Engineer_Questions.jsonl")
+word_items = []
+
+# Find a question through Google: try the top 2 results for the right exam
+def search_question(i):
     query = f"exam professional cloud devops engineer question number {i}"
     driver.get("https://www.google.com/")
 
@@ -62,11 +80,33 @@ for i in range(170, 203):
             driver.back()
             time.sleep(2)
 
+    return valid_question
+
+
+# Open a question's discussion page, straight from the URL index when it has it
+def open_question(i):
+    url = url_index.lookup(EXAM_SLUG, i)
+    if url:
+        driver.get(url)
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CLASS_NAME, 'question-discussion-header'))
+            )
+            return True
+        except TimeoutException:
+            print(f"[Q{i}] Indexed page did not load, searching instead.")
+    return search_question(i)
+
+
+for i in range(170, 203):
+    valid_question = open_question(i)
+
     # If none of the top 2 results match, write "Question not found" and skip the rest
     if not valid_question:
         print(f"[Q{i}] Question not found in top 2 results.")
-        doc.add_paragraph(f"Question #: {i}", style='Heading 2')
-        doc.add_paragraph("Question not found.")
+        record = build_question_json("Question not found.", [], [], EXAM_SLUG, question=i)
+        questions_jsonl.write(record)
+        word_items.append((f"Question #: {i}", record))
         continue
 
     # Wait for the popup and remove it
@@ -86,7 +126,7 @@ for i in range(170, 203):
 
         # Extract Question Number
         question_number = \
-        question_section.find_element(By.CSS_SELECTOR, '.question-discussion-header div').text.split('\n')[0]
+        question_heading(question_section.find_element(By.CSS_SELECTOR, '.question-discussion-header div').text)
 
         # Extract Question Text
         question = question_section.find_element(By.CLASS_NAME, 'question-body').find_element(By.TAG_NAME, 'p').text
@@ -109,26 +149,29 @@ for i in range(170, 203):
             answer = answer_element.text.strip()
         except:
             answer = "Not found"
+        archive.put(driver.current_url, EXAM_SLUG, driver.page_source, source="browser")
 
 
         # Extract Answer
         # answer_element = question_section.find_element(By.CLASS_NAME, 'correct-answer')
         # answer = answer_element.text.strip()
 
-        # Write to Word
-        doc.add_paragraph(f"{question_number}", style='Heading 2')
-        doc.add_paragraph(f"Q: {question}")
-        for opt in options_text:
-            doc.add_paragraph(opt, style='List Bullet')
-        doc.add_paragraph(f"Solution: {answer}", style='Intense Quote')
+        record = build_question_json(question, options_text, correct_option_letters(answer), EXAM_SLUG,
+                                     *heading_numbers(question_number))
+        questions_jsonl.write(record)
+        word_items.append((question_number, record))
 
     except Exception as e:
         print(f"Error on Question {i}: {e}")
 
     time.sleep(2)  # small pause between iterations
 
-# Save Word File
-doc.save("Cloud_DevOps_Engineer_Questions.docx")
+# Save JSON and render the Word file from the records
+questions_jsonl.close()
+jsonl_to_json("Cloud_DevOps_Engineer_Questions.jsonl", "Cloud_DevOps_Engineer_Questions.json")
+render_with_xml_template(word_items, "Cloud_DevOps_Engineer_Questions.docx",
+                         "Professional Cloud DevOps Engineer Actual Exam Questions")
 
 # Close browser
+archive.close()
 driver.quit()
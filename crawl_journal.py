@@ -0,0 +1,92 @@
+import json
+import os
+import time
+
+
+class CrawlJournal:
+    """Append-only JSON Lines journal of finished listing pages and their links.
+
+    Records are flushed and fsync'ed in batches (every ``fsync_every`` pages or
+    ``fsync_interval`` seconds), so a crash loses at most one batch. A torn last
+    line from a crash mid-write is ignored when the journal is loaded.
+    """
+
+    def __init__(self, path, provider, search_string, resume=False, fsync_every=25, fsync_interval=2.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.pages = {}
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+        header = {"provider": provider, "search": search_string or ""}
+        if resume and os.path.exists(path):
+            self._load(header)
+        else:
+            self._start(header)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _start(self, header):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load(self, header):
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.readlines()
+        try:
+            existing = json.loads(lines[0]) if lines else None
+        except json.JSONDecodeError:
+            existing = None
+        if existing != header:
+            print(f"[Journal] {self.path} belongs to a different crawl ({existing}), starting over.")
+            self._start(header)
+            return
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break  # torn write at the end of the journal
+            self.pages[record["page"]] = record["links"]
+        # Rewrite without any torn tail so later appends stay line-aligned
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header) + "\n")
+            for page, links in self.pages.items():
+                f.write(json.dumps({"page": page, "links": links}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"[Journal] Resuming: {len(self.pages)} pages already completed.")
+
+    def completed_pages(self):
+        return set(self.pages)
+
+    def links(self, exclude=()):
+        """All links recorded by completed pages (other than ``exclude``), in page order."""
+        return [link for page in sorted(self.pages) if page not in exclude for link in self.pages[page]]
+
+    def record_page(self, page, links):
+        self.pages[page] = links
+        self._file.write(json.dumps({"page": page, "links": links}) + "\n")
+        self._pending += 1
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def finish(self):
+        """Close and delete the journal once its links have been safely exported."""
+        self.close()
+        os.remove(self.path)
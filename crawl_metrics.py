@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+from collections import Counter
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += count
+            yield bound, total
+
+    def quantile(self, q):
+        """Upper bucket bound containing the q-quantile (approximate)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, total in self.cumulative():
+            if total >= target:
+                return bound if bound != "+Inf" else self.buckets[-1]
+        return self.buckets[-1]
+
+
+class CrawlMetrics:
+    """Thread-safe counters for a crawl: request latency, bytes, parse time, throughput, errors.
+
+    Pages answered from the HTTP cache (fresh or revalidated with a 304) are
+    counted as cache hits only, so latency and bytes describe full downloads.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.request_latency = Histogram(LATENCY_BUCKETS)
+        self.parse_time = Histogram(PARSE_BUCKETS)
+        self.bytes_received = 0
+        self.cache_hits = 0
+        self.pages = 0
+        self.links = 0
+        self.errors = Counter()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Restart the throughput clock, so time spent before the crawl (e.g. waiting on a prompt) is not counted."""
+        self.started = time.monotonic()
+
+    def observe_request(self, latency, nbytes):
+        with self._lock:
+            self.request_latency.observe(latency)
+            self.bytes_received += nbytes
+
+    def observe_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def observe_parse(self, seconds, links):
+        with self._lock:
+            self.parse_time.observe(seconds)
+            self.pages += 1
+            self.links += links
+
+    def record_error(self, kind):
+        with self._lock:
+            self.errors[kind] += 1
+
+    def summary(self):
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                "elapsed_seconds": round(elapsed, 3),
+                "pages": self.pages,
+                "links": self.links,
+                "pages_per_second": round(self.pages / elapsed, 3) if elapsed else 0.0,
+                "bytes_received": self.bytes_received,
+                "requests": self.request_latency.count,
+                "cache_hits": self.cache_hits,
+                "request_latency_p50": self.request_latency.quantile(0.5),
+                "request_latency_p95": self.request_latency.quantile(0.95),
+                "request_latency_mean": round(self.request_latency.sum / self.request_latency.count, 4)
+                if self.request_latency.count else 0.0,
+                "parse_seconds_total": round(self.parse_time.sum, 4),
+                "parse_time_p95": self.parse_time.quantile(0.95),
+                "errors": dict(self.errors),
+            }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=4)
+
+    def prometheus_text(self):
+        summary = self.summary()
+        lines = []
+
+        def histogram(name, help_text, hist):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for bound, total in hist.cumulative():
+                lines.append(f'{name}_bucket{{le="{bound}"}} {total}')
+            lines.append(f"{name}_sum {hist.sum:.6f}")
+            lines.append(f"{name}_count {hist.count}")
+
+        with self._lock:
+            histogram("examtopics_request_latency_seconds", "Listing page request latency.", self.request_latency)
+            histogram("examtopics_parse_seconds", "Listing page HTML parse time.", self.parse_time)
+        for name, kind, help_text, value in (
+            ("examtopics_bytes_received_total", "counter", "Response bytes received.", summary["bytes_received"]),
+            ("examtopics_cache_hits_total", "counter", "Listing pages answered from the HTTP cache.",
+             summary["cache_hits"]),
+            ("examtopics_pages_total", "counter", "Listing pages parsed.", summary["pages"]),
+            ("examtopics_links_total", "counter", "Discussion links kept.", summary["links"]),
+            ("examtopics_pages_per_second", "gauge", "Parsed pages per second over the crawl.", summary["pages_per_second"]),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+        lines += ["# HELP examtopics_errors_total Failed requests by error type.", "# TYPE examtopics_errors_total counter"]
+        for kind, count in sorted(summary["errors"].items()):
+            lines.append(f'examtopics_errors_total{{type="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+
+    def report(self, json_path=None, prometheus_path=None):
+        summary = self.summary()
+        print(f"[Metrics] {summary['pages']} pages in {summary['elapsed_seconds']}s "
+              f"({summary['pages_per_second']} pages/s), {summary['bytes_received']} bytes, "
+              f"{summary['cache_hits']} cache hits, "
+              f"p95 latency {summary['request_latency_p95']}s, errors {summary['errors'] or 'none'}")
+        if json_path:
+            self.write_json(json_path)
+        if prometheus_path:
+            self.write_prometheus(prometheus_path)
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import re
+
+from link_index import discussion_view_id
+
+# Questions whose distinguishing detail is in an image: the text alone cannot tell them apart
+EXHIBIT_PATTERN = re.compile(
+    r'\bexhibits?\b|\bshown in the following\b|\bthe following (?:table|graphic|image|figure|diagram)s?\b',
+    re.IGNORECASE,
+)
+
+
+def dedup_urls(urls):
+    """Drop repeated discussions by numeric view id (exact URL for links without one), keeping CSV order."""
+    seen = set()
+    unique = []
+    duplicates = 0
+    for url in urls:
+        view_id = discussion_view_id(url)
+        key = view_id if view_id is not None else url.strip().rstrip("/").lower()
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        unique.append(url)
+    if duplicates:
+        print(f"[Dedup] Skipping {duplicates} duplicate discussion URLs.")
+    return unique
+
+
+def _normalise(text):
+    return " ".join(text.lower().split())
+
+
+def question_hash(record):
+    """Content hash of a question record: normalised text, its options in order and the correct letters."""
+    parts = [_normalise(record.get("text", ""))]
+    parts += [_normalise(opt.get("text", "")) for opt in record.get("options", [])]
+    parts.append("".join(opt.get("id", "") for opt in record.get("options", []) if opt.get("isCorrect")))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def content_dedupable(record):
+    """Whether equal content means the same question.
+
+    Not for questions without options (HOTSPOT, drag and drop) or that refer
+    to an exhibit or table: those differ in images the record does not hold.
+    """
+    return bool(record.get("options")) and not EXHIBIT_PATTERN.search(record.get("text", ""))
+
+
+class QuestionDeduper:
+    """Assign content-hash ids to question records and drop repeats.
+
+    A question seen twice in the same exam is stored once. A question shared
+    with other exams keeps its record in each exam's bank (banks stay standalone)
+    but gets the same ``id`` everywhere, and the optional registry file records
+    which exams reference it. Questions whose content cannot identify them
+    (see content_dedupable) are always kept.
+    """
+
+    def __init__(self, registry_path=None):
+        self.registry_path = registry_path
+        self.registry = {}
+        if registry_path and os.path.exists(registry_path):
+            with open(registry_path, encoding="utf-8") as f:
+                self.registry = json.load(f)
+        self.seen = set()
+        self.duplicates = 0
+
+    def add(self, record):
+        """Stamp ``record['id']``; returns False if it duplicates a question already kept for this exam."""
+        digest = question_hash(record)
+        question_id = digest[:16]
+        record["id"] = question_id
+        if not content_dedupable(record):
+            return True
+        key = (record.get("examId"), question_id)
+        if key in self.seen:
+            self.duplicates += 1
+            return False
+        self.seen.add(key)
+        exams = self.registry.setdefault(question_id, [])
+        if record.get("examId") not in exams:
+            exams.append(record.get("examId"))
+        return True
+
+    def save(self):
+        if self.duplicates:
+            print(f"[Dedup] Dropped {self.duplicates} duplicate questions.")
+        if not self.registry_path:
+            return
+        shared = sum(1 for exams in self.registry.values() if len(exams) > 1)
+        print(f"[Dedup] {len(self.registry)} unique questions, {shared} shared across exams.")
+        tmp_path = self.registry_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.registry, f, indent=4)
+        os.replace(tmp_path, self.registry_path)
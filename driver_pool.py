@@ -0,0 +1,82 @@
+import queue
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+
+def driver_is_healthy(driver):
+    try:
+        return driver.execute_script("return 1") == 1
+    except WebDriverException:
+        return False
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    """N browser workers fed from one shared work queue.
+
+    Each worker owns a driver created by ``driver_factory``. Drivers are
+    health-checked before every page, recycled after ``recycle_after`` pages, and
+    replaced (with the page retried once) when they crash.
+    """
+
+    def __init__(self, driver_factory, size=4, recycle_after=50, max_attempts=2):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.recycle_after = recycle_after
+        self.max_attempts = max_attempts
+
+    def _worker(self, worker_id, work, results, task):
+        driver = None
+        pages = 0
+        while True:
+            try:
+                index, item, attempt = work.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                if driver is not None and (pages >= self.recycle_after or not driver_is_healthy(driver)):
+                    print(f"[Driver {worker_id}] Recycling driver after {pages} pages")
+                    _quit(driver)
+                    driver = None
+                if driver is None:
+                    driver = self.driver_factory()
+                    pages = 0
+                results[index] = task(driver, item)
+                pages += 1
+            except WebDriverException as e:
+                print(f"[Driver {worker_id}] Driver crashed on item {index}: {e.msg if hasattr(e, 'msg') else e}")
+                if driver is not None:
+                    _quit(driver)
+                driver = None
+                if attempt + 1 < self.max_attempts:
+                    work.put((index, item, attempt + 1))
+            finally:
+                work.task_done()
+        if driver is not None:
+            _quit(driver)
+
+    def map(self, task, items):
+        """Run ``task(driver, item)`` for every item; results come back in input order (None on failure)."""
+        items = list(items)
+        results = [None] * len(items)
+        if not items:
+            return results
+        work = queue.Queue()
+        for index, item in enumerate(items):
+            work.put((index, item, 0))
+        workers = [
+            threading.Thread(target=self._worker, args=(n, work, results, task), daemon=True)
+            for n in range(min(self.size, len(items)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
@@ -0,0 +1,88 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from question_store import discussion_key
+from static_extractor import StaticParseError, parse_question_html
+
+
+def object_path(root, digest):
+    return os.path.join(root, "objects", digest[:2], digest + ".z")
+
+
+def read_object(root, digest):
+    """Decompress one archived page; usable from worker processes without opening the index."""
+    with open(object_path(root, digest), "rb") as f:
+        return zlib.decompress(f.read()).decode("utf-8")
+
+
+def parse_archived_page(root, digest):
+    """Process-pool task: re-run the static extractor on one archived page.
+
+    Returns (digest, fields, error); exactly one of fields and error is None.
+    """
+    try:
+        return digest, parse_question_html(read_object(root, digest)), None
+    except (OSError, zlib.error, StaticParseError) as e:
+        return digest, None, str(e)
+    except Exception as e:
+        # Any other extractor bug fails only this page, not the whole reparse
+        return digest, None, f"{type(e).__name__}: {e}"
+
+
+class HtmlArchive:
+    """Content-addressed, compressed archive of every fetched question page.
+
+    Page bodies are stored once per SHA-256 digest under ``objects/``; a SQLite
+    index maps each discussion to the digest of its latest fetch, so pages can
+    be re-extracted offline whenever the parser changes.
+    """
+
+    def __init__(self, root=".question_archive"):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "discussion TEXT PRIMARY KEY, url TEXT, exam_id TEXT, digest TEXT, source TEXT, fetched REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_exam ON pages (exam_id)")
+        self._db.commit()
+
+    def put(self, url, exam_id, html, source="static"):
+        """Archive a page body; returns its digest. Identical bodies are written once."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = object_path(self.root, digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(data, 6))
+            os.replace(tmp_path, path)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (discussion_key(url), url, exam_id, digest, source, time.time()),
+            )
+            self._db.commit()
+        return digest
+
+    def get(self, digest):
+        return read_object(self.root, digest)
+
+    def pages(self, exam_id=None):
+        """``discussion key -> digest`` for every archived page (of one exam, if given)."""
+        with self._lock:
+            if exam_id is None:
+                rows = self._db.execute("SELECT discussion, digest FROM pages")
+            else:
+                rows = self._db.execute("SELECT discussion, digest FROM pages WHERE exam_id = ?", (exam_id,))
+            return dict(rows.fetchall())
+
+    def close(self):
+        self._db.close()
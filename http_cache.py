@@ -0,0 +1,171 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+
+
+class HttpCache:
+    """On-disk, compressed response cache keyed by URL with LRU size/age eviction.
+
+    Every hit is revalidated with the origin unless ``fresh_for`` (seconds) is
+    set, in which case entries younger than that are served as they are.
+    """
+
+    def __init__(self, cache_dir, fresh_for=0, max_age=30 * 24 * 3600, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.fresh_for = fresh_for
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+            "stored_at REAL, last_access REAL, size INTEGER)"
+        )
+        self._db.commit()
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".z")
+
+    def lookup(self, url):
+        """Return (body, etag, last_modified, age) for a cached URL, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, stored_at FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            with open(self._path(url), "rb") as f:
+                body = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            self.delete(url)
+            return None
+        etag, last_modified, stored_at = row
+        return body, etag, last_modified, time.time() - stored_at
+
+    def is_fresh(self, entry):
+        return entry[3] < self.fresh_for
+
+    def conditional_headers(self, entry):
+        """Headers for revalidating a cached entry with the origin."""
+        headers = {}
+        if entry[1]:
+            headers["If-None-Match"] = entry[1]
+        if entry[2]:
+            headers["If-Modified-Since"] = entry[2]
+        return headers
+
+    def store(self, url, body, headers):
+        data = zlib.compress(body, 6)
+        tmp_path = self._path(url) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(url))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (url, headers.get("ETag"), headers.get("Last-Modified"), now, now, len(data)),
+            )
+            self._db.commit()
+
+    def touch(self, url, revalidated=False):
+        """Mark an entry as recently used (and, after a 304, as freshly validated)."""
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self._db.execute("UPDATE entries SET last_access = ?, stored_at = ? WHERE url = ?", (now, now, url))
+            else:
+                self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (now, url))
+            self._db.commit()
+
+    def delete(self, url):
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+        try:
+            os.remove(self._path(url))
+        except OSError:
+            pass
+
+    def prune(self):
+        """Drop entries older than max_age, then least recently used ones until under max_bytes."""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            expired = [r[0] for r in self._db.execute("SELECT url FROM entries WHERE stored_at < ?", (cutoff,))]
+            rows = self._db.execute(
+                "SELECT url, size FROM entries WHERE stored_at >= ? ORDER BY last_access DESC", (cutoff,)
+            ).fetchall()
+        total = 0
+        evicted = []
+        for url, size in rows:
+            total += size
+            if total > self.max_bytes:
+                evicted.append(url)
+        for url in expired + evicted:
+            self.delete(url)
+        print(f"[Cache] Pruned {len(expired)} expired and {len(evicted)} LRU entries.")
+
+
+class CachedSession(requests.Session):
+    """requests.Session that serves GETs from an HttpCache, revalidating with ETag/If-Modified-Since.
+
+    With ``offline=True`` nothing touches the network: cached bodies are replayed
+    and uncached URLs raise ``requests.ConnectionError``. ``revalidate=True`` on
+    a GET skips the cache's fresh window for that request. Closing the session
+    prunes the cache to its age and size limits.
+    """
+
+    def __init__(self, cache, offline=False):
+        super().__init__()
+        self.cache = cache
+        self.offline = offline
+
+    def _cached_response(self, url, body):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = body
+        response.encoding = "utf-8"
+        response.from_cache = True
+        return response
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != "GET":
+            return super().request(method, url, *args, **kwargs)
+
+        revalidate = kwargs.pop("revalidate", False)
+        entry = self.cache.lookup(url)
+        if self.offline:
+            if entry is None:
+                raise requests.ConnectionError(f"Offline replay: {url} is not cached")
+            self.cache.touch(url)
+            return self._cached_response(url, entry[0])
+        if entry is not None and not revalidate and self.cache.is_fresh(entry):
+            self.cache.touch(url)
+            return self._cached_response(url, entry[0])
+
+        if entry is not None:
+            headers = dict(kwargs.pop("headers", None) or {})
+            headers.update(self.cache.conditional_headers(entry))
+            kwargs["headers"] = headers
+        response = super().request(method, url, *args, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url, revalidated=True)
+            return self._cached_response(url, entry[0])
+        if response.status_code == 200:
+            self.cache.store(url, response.content, response.headers)
+        response.from_cache = False
+        return response
+
+    def close(self):
+        if not self.offline:
+            self.cache.prune()
+        super().close()
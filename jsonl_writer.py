@@ -0,0 +1,109 @@
+import json
+import os
+import re
+
+_ARRAY_SEPARATOR = re.compile(r"[\s,]*")
+
+
+class JsonlWriter:
+    """Append question records to a JSON Lines file as they are produced.
+
+    The file is flushed every ``flush_every`` records so other processes can
+    tail it while the scrape is still running, and fsync'ed on close.
+    """
+
+    def __init__(self, path, flush_every=10, append=False):
+        self.path = path
+        self.flush_every = flush_every
+        self.count = 0
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_jsonl(path):
+    """Yield records from a JSON Lines file, ignoring a torn last line from an interrupted run."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"[JSONL] Skipping unreadable line in {path}")
+
+
+def iter_json_array(path, chunk_size=1 << 16):
+    """Yield the elements of a file holding one top-level JSON array, without loading the whole file.
+
+    Raises ValueError if the file is not a JSON array.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer = f.read(chunk_size).lstrip("\ufeff \t\r\n")
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} does not hold a JSON array")
+        pos = 1
+        while True:
+            pos = _ARRAY_SEPARATOR.match(buffer, pos).end()
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos) if pos < len(buffer) else (None, len(buffer))
+            except json.JSONDecodeError:
+                end = len(buffer)
+            if end == len(buffer):
+                # The element may continue in the next chunk; read at least as much again as is buffered
+                more = f.read(max(chunk_size, len(buffer) - pos))
+                if not more:
+                    raise ValueError(f"{path} ends inside its JSON array")
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            yield record
+            pos = end
+
+
+def write_json_records(records, out):
+    """Write records to an open file in the banks' pretty JSON array format (json.dump(..., indent=4)).
+
+    Returns the number of records written.
+    """
+    count = 0
+    for record in records:
+        out.write("[\n" if count == 0 else ",\n")
+        body = json.dumps(record, indent=4, ensure_ascii=False)
+        out.write("\n".join("    " + line for line in body.split("\n")))
+        count += 1
+    out.write("\n]" if count else "[]")
+    return count
+
+
+def jsonl_to_json(jsonl_path, json_path):
+    """Stream a JSON Lines file into the banks' pretty JSON array format.
+
+    Records are converted one at a time, so memory stays flat for large exams.
+    Returns the number of records written.
+    """
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        count = write_json_records(iter_jsonl(jsonl_path), out)
+    os.replace(tmp_path, json_path)
+    return count
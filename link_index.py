@@ -0,0 +1,55 @@
+import re
+import sqlite3
+import time
+
+VIEW_ID_PATTERN = re.compile(r'/view/(\d+)-')
+
+
+def discussion_view_id(link):
+    """Return the numeric discussion view id embedded in a link, or None."""
+    match = VIEW_ID_PATTERN.search(link)
+    return int(match.group(1)) if match else None
+
+
+class LinkIndex:
+    """Persistent SQLite index of discussion links already seen, keyed by view id."""
+
+    def __init__(self, db_path="examtopics_links.sqlite"):
+        self.db_path = db_path
+        self._db = sqlite3.connect(db_path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS links ("
+            "view_id INTEGER PRIMARY KEY, provider TEXT, url TEXT, first_seen REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS links_provider ON links (provider)")
+        self._db.commit()
+
+    def known_ids(self, view_ids):
+        """Return the subset of ``view_ids`` already in the index."""
+        view_ids = list(view_ids)
+        known = set()
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(view_ids), 500):
+            chunk = view_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._db.execute(f"SELECT view_id FROM links WHERE view_id IN ({placeholders})", chunk)
+            known.update(row[0] for row in rows)
+        return known
+
+    def add_links(self, provider, links):
+        """Record links; returns how many were new."""
+        now = time.time()
+        rows = [(view_id, provider, link, now) for link in links
+                if (view_id := discussion_view_id(link)) is not None]
+        before = self._db.total_changes
+        self._db.executemany("INSERT OR IGNORE INTO links VALUES (?, ?, ?, ?)", rows)
+        self._db.commit()
+        return self._db.total_changes - before
+
+    def links(self, provider):
+        """All indexed links for a provider, newest discussion first."""
+        rows = self._db.execute("SELECT url FROM links WHERE provider = ? ORDER BY view_id DESC", (provider,))
+        return [row[0] for row in rows]
+
+    def close(self):
+        self._db.close()
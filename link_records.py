@@ -0,0 +1,69 @@
+import re
+from operator import attrgetter
+
+# Links without a question number sort after every numbered question of their topic
+MISSING_QUESTION = 9999
+
+LINK_PATTERN = re.compile(r'/view/(\d+)-exam-([a-z0-9\-]+?)-topic-(\d+)-question(?:-(\d+)|/?$)')
+# Fallback for links that carry a topic/question but no view id or exam slug
+TOPIC_PATTERN = re.compile(r'topic-(\d+)-question(?:-(\d+)|/?$)')
+
+
+class LinkRecord:
+    """A discussion link parsed once into view id, exam slug, topic and question."""
+
+    __slots__ = ("view_id", "exam", "topic", "question", "url")
+
+    def __init__(self, view_id, exam, topic, question, url):
+        self.view_id = view_id
+        self.exam = exam
+        self.topic = topic
+        self.question = question
+        self.url = url
+
+    @property
+    def key(self):
+        return (self.topic, self.question)
+
+    def __repr__(self):
+        return f"LinkRecord({self.view_id}, {self.exam!r}, {self.topic}, {self.question}, {self.url!r})"
+
+
+def _record(url, match):
+    if match is not None:
+        view_id, exam, topic, question = match.groups()
+        view_id = int(view_id)
+    else:
+        match = TOPIC_PATTERN.search(url)
+        if match is None:
+            return None
+        view_id, exam = None, None
+        topic, question = match.groups()
+    return LinkRecord(view_id, exam, int(topic), int(question) if question else MISSING_QUESTION, url)
+
+
+def parse_link(link):
+    """Parse a single link into a LinkRecord, or None if it has no topic/question."""
+    return _record(link, LINK_PATTERN.search(link))
+
+
+def parse_links(links):
+    """Parse a batch of links, running the pattern over the whole list at C speed.
+
+    Links without a topic are dropped.
+    """
+    records = map(_record, links, map(LINK_PATTERN.search, links))
+    return [record for record in records if record is not None]
+
+
+sort_key = attrgetter("topic", "question")
+question_key = attrgetter("question")
+
+
+def group_by_exam(records):
+    """Group records into ``exam -> [records]``, keeping input order within each exam."""
+    grouped = {}
+    for record in records:
+        if record.exam is not None:
+            grouped.setdefault(record.exam, []).append(record)
+    return grouped
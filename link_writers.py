@@ -0,0 +1,136 @@
+import csv
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+HEADER = ("Question Number", "Link")
+PARQUET_BATCH_ROWS = 10000
+
+
+def write_xlsx(path, rows):
+    """Stream rows into an .xlsx file with openpyxl's write-only mode."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    count = 0
+    for row in rows:
+        sheet.append(row)
+        count += 1
+    workbook.save(path)
+    return count
+
+
+def write_csv(path, rows):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_parquet(path, rows):
+    """Write rows to Parquet in fixed-size record batches."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(HEADER[0], pa.int64()), (HEADER[1], pa.string())])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= PARQUET_BATCH_ROWS:
+                writer.write_batch(_parquet_batch(pa, schema, batch))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_batch(_parquet_batch(pa, schema, batch))
+            count += len(batch)
+    return count
+
+
+def _parquet_batch(pa, schema, batch):
+    numbers, links = zip(*batch)
+    return pa.record_batch([pa.array(numbers, pa.int64()), pa.array(links, pa.string())], schema=schema)
+
+
+WRITERS = {
+    "xlsx": write_xlsx,
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+class RowSpool:
+    """(exam, question number, link) rows spooled to a temporary SQLite file.
+
+    Rows go to disk as they are added and each writer reads back only its own
+    exam's rows, sorted by SQLite, so no process holds a whole exam in memory.
+    """
+
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp(prefix="exam_rows_", suffix=".sqlite")
+        os.close(fd)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode = OFF")
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute("CREATE TABLE rows (exam TEXT NOT NULL, question INTEGER NOT NULL, url TEXT NOT NULL)")
+
+    def add(self, rows):
+        """Spool an iterable of (exam, question number, link) rows."""
+        self._db.executemany("INSERT INTO rows VALUES (?, ?, ?)", rows)
+
+    def exams(self):
+        """Index the spooled rows and return the exam names, in the order they were first added."""
+        self._db.execute("CREATE INDEX IF NOT EXISTS rows_exam ON rows (exam, question)")
+        self._db.commit()
+        return [exam for exam, in self._db.execute("SELECT exam FROM rows GROUP BY exam ORDER BY MIN(rowid)")]
+
+    def close(self):
+        self._db.close()
+        os.remove(self.path)
+
+
+def spooled_rows(spool_path, exam_name):
+    """Stream one exam's (question number, link) rows from a RowSpool file, by question number then spool order."""
+    db = sqlite3.connect(spool_path)
+    try:
+        yield from db.execute("SELECT question, url FROM rows WHERE exam = ? ORDER BY question, rowid", (exam_name,))
+    finally:
+        db.close()
+
+
+def write_exam_file(exam_name, rows, fmt="xlsx", out_dir="."):
+    """Write one exam's (question number, link) rows, returning (file name, row count)."""
+    file_name = os.path.join(out_dir, f"{exam_name}.{fmt}")
+    return file_name, WRITERS[fmt](file_name, rows)
+
+
+def write_spooled_exam(spool_path, exam_name, fmt="xlsx", out_dir="."):
+    return write_exam_file(exam_name, spooled_rows(spool_path, exam_name), fmt, out_dir)
+
+
+def write_exam_files(spool, fmt="xlsx", out_dir=".", workers=None):
+    """Write every exam in a RowSpool to its own file, one exam per worker process.
+
+    Workers get only the spool path and an exam name and stream that exam's
+    sorted rows from the spool, so memory stays flat in the link count.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    exams = spool.exams()
+    if len(exams) <= 1 or workers == 1:
+        results = [write_spooled_exam(spool.path, name, fmt, out_dir) for name in exams]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(write_spooled_exam, spool.path, name, fmt, out_dir) for name in exams]
+            results = [future.result() for future in as_completed(futures)]
+    for file_name, count in results:
+        print(f"[Write {fmt.upper()}] {file_name} created with {count} questions.")
+    return results
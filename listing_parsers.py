@@ -0,0 +1,124 @@
+import html
+import re
+
+from bs4 import BeautifulSoup
+
+
+class Bs4ListingParser:
+    """Reference backend: full BeautifulSoup tree with the stdlib html.parser."""
+
+    name = "bs4"
+
+    def links(self, content):
+        soup = BeautifulSoup(content, "html.parser")
+        return [a["href"] for a in soup.find_all("a", {"class": "discussion-link"}) if a.has_attr("href")]
+
+    def num_pages(self, content):
+        soup = BeautifulSoup(content, "html.parser")
+        indicator = soup.find("span", {"class": "discussion-list-page-indicator"})
+        if indicator is None:
+            return None
+        return int(indicator.find_all("strong")[1].text.strip())
+
+
+class LxmlListingParser:
+    """libxml2 HTML parser with precompiled XPath selectors for just the nodes we need."""
+
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import etree, html as lxml_html
+
+        self._fromstring = lxml_html.fromstring
+        self._links = etree.XPath(
+            "//a[contains(concat(' ', normalize-space(@class), ' '), ' discussion-link ')]/@href"
+        )
+        self._indicator = etree.XPath(
+            "(//span[contains(concat(' ', normalize-space(@class), ' '), ' discussion-list-page-indicator ')])[1]//strong"
+        )
+
+    def links(self, content):
+        return [str(href) for href in self._links(self._fromstring(content))]
+
+    def num_pages(self, content):
+        strongs = self._indicator(self._fromstring(content))
+        if len(strongs) < 2:
+            return None
+        return int(strongs[1].text_content().strip())
+
+
+class RegexListingParser:
+    """Streaming tokenizer: scans raw bytes for the anchor/span tags without building a tree.
+
+    Comments are stripped first, and tag attributes are tokenized with quoted
+    values intact, so a ``>`` inside a quoted value does not end the tag.
+    """
+
+    name = "regex"
+
+    _comment = re.compile(rb'<!--.*?(?:-->|$)', re.DOTALL)
+    _tag_attrs = rb'([^<>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^<>"\']*)*)>'
+    _anchor = re.compile(rb'<a(?=[\s/>])' + _tag_attrs, re.IGNORECASE)
+    _attr = re.compile(rb'([^\s"\'>/=]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+)))?')
+    _span = re.compile(rb'<span(?=[\s/>])' + _tag_attrs, re.IGNORECASE)
+    _span_end = re.compile(rb'</span\s*>', re.IGNORECASE)
+    _strong = re.compile(rb'<strong[^>]*>\s*([^<]*?)\s*</strong>', re.IGNORECASE)
+
+    def _prepare(self, content):
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        if b"<!--" in content:
+            content = self._comment.sub(b"", content)
+        return content
+
+    def _attributes(self, raw):
+        attrs = {}
+        for name, double, single, bare in self._attr.findall(raw):
+            attrs[name.lower()] = double or single or bare
+        return attrs
+
+    def _has_class(self, attrs, name):
+        return name in attrs.get(b"class", b"").split()
+
+    def links(self, content):
+        content = self._prepare(content)
+        hrefs = []
+        for anchor in self._anchor.finditer(content):
+            if b"discussion-link" not in anchor.group(1):
+                continue
+            attrs = self._attributes(anchor.group(1))
+            if self._has_class(attrs, b"discussion-link") and b"href" in attrs:
+                hrefs.append(html.unescape(attrs[b"href"].decode("utf-8")))
+        return hrefs
+
+    def num_pages(self, content):
+        content = self._prepare(content)
+        indicator = b"discussion-list-page-indicator"
+        for span in self._span.finditer(content):
+            if indicator not in span.group(1) or not self._has_class(self._attributes(span.group(1)), indicator):
+                continue
+            end = self._span_end.search(content, span.end())
+            strongs = self._strong.findall(content, span.end(), end.start() if end else len(content))
+            if len(strongs) < 2:
+                return None
+            return int(strongs[1])
+        return None
+
+
+BACKENDS = {
+    "bs4": Bs4ListingParser,
+    "lxml": LxmlListingParser,
+    "regex": RegexListingParser,
+}
+
+
+def get_listing_parser(name="auto"):
+    """Instantiate a listing page parser backend; "auto" prefers lxml when it is installed."""
+    if name == "auto":
+        try:
+            return LxmlListingParser()
+        except ImportError:
+            return Bs4ListingParser()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown listing parser backend: {name}")
+    return BACKENDS[name]()
@@ -0,0 +1,222 @@
+import argparse
+import csv
+import heapq
+import io
+import os
+import re
+from operator import itemgetter
+
+from docx import Document
+from docx.opc.packuri import PackURI
+from docx.oxml.ns import nsmap
+
+from dedup import content_dedupable, dedup_urls, question_hash
+from jsonl_writer import JsonlWriter, iter_json_array, jsonl_to_json
+from link_records import parse_links
+from question_index import (QuestionIndex, element_text_hash, paragraph_element_text, question_entries,
+                            question_topic)
+from sort_word_file import extract_question_elements
+
+DEFAULT_TOPIC = 1
+RELATIONSHIP_PREFIX = "{%s}" % nsmap["r"]
+OPTION_PATTERN = re.compile(r'[A-Z]\.\s')
+PARTNAME_NUMBER = re.compile(r'\d*(\.\w+)$')
+
+merge_key = itemgetter(0, 1)
+
+
+def link_topics(csv_paths):
+    """``question number -> [topics]`` in link CSV order, the order the scraper writes questions in."""
+    links = []
+    for path in csv_paths:
+        with open(path, newline="", encoding="utf-8") as f:
+            links += [row[1] for row in csv.reader(f) if len(row) > 1 and row[1].startswith("http")]
+    topics = {}
+    for record in parse_links(dedup_urls(links)):
+        topics.setdefault(record.question, []).append(record.topic)
+    return topics
+
+
+def docx_question_dedupable(elements):
+    """content_dedupable for a question's body paragraphs ("Q: ...", the options, "Answer: ...")."""
+    texts = [paragraph_element_text(element) for element in elements]
+    options = [text for text in texts if OPTION_PATTERN.match(text)]
+    return content_dedupable({"text": texts[0] if texts else "", "options": options})
+
+
+def docx_questions(doc, source, topics_by_number=None):
+    """(topic, number, source, content hash, elements, dedupable) per question of a generated document, in key order.
+
+    Topics come from the "Topic #: T" in each heading; see question_topic for
+    documents generated before headings carried one.
+    """
+    _, questions, _ = extract_question_elements(doc)
+    items = []
+    occurrences = {}
+    for number, elements in questions:
+        topic = question_topic(number, occurrences, topics_by_number, paragraph_element_text(elements[0]))
+        items.append((topic, number, source, element_text_hash(elements[1:]), elements,
+                      docx_question_dedupable(elements[1:])))
+    items.sort(key=merge_key)
+    return items
+
+
+def json_questions(path, source, offset=0):
+    """(topic, number, source, content hash, record, dedupable) per record of a question bank.
+
+    Records without "topic"/"question" fields are numbered after every earlier
+    input (``offset`` onwards), so unnumbered banks concatenate in input order
+    and only their repeated content is dropped. Banks are not stored in key
+    order, so the whole bank is held and sorted in memory.
+    """
+    items = [
+        (record.get("topic", DEFAULT_TOPIC), record.get("question", offset + position),
+         source, question_hash(record), record, content_dedupable(record))
+        for position, record in enumerate(iter_json_array(path), start=1)
+    ]
+    items.sort(key=merge_key)
+    return items
+
+
+def merge_sorted(sources):
+    """k-way merge of per-source sorted questions by (topic, question).
+
+    A (topic, question) repeated with the same content is kept once, from the
+    earliest source. Repeated with different content it is a conflict: both
+    are kept and reported, since neither can be told to be the stale one. A
+    question whose content was already kept under another number is dropped,
+    unless its content cannot identify it (see content_dedupable), so one
+    content hash per kept question is held until the merge ends.
+    """
+    last_key = None
+    key_contents = {}
+    seen_content = set()
+    stats = {"kept": 0, "duplicate_numbers": 0, "duplicate_content": 0, "conflicts": 0}
+    for item in heapq.merge(*sources, key=merge_key):
+        key = merge_key(item)
+        if key != last_key:
+            last_key = key
+            key_contents = {}
+        elif item[3] in key_contents:
+            stats["duplicate_numbers"] += 1
+            continue
+        else:
+            stats["conflicts"] += 1
+            first_source = next(iter(key_contents.values()))
+            print(f"[Merge] Conflict: topic {key[0]} question {key[1]} differs between input {first_source + 1} "
+                  f"and input {item[2] + 1}; keeping both.")
+        key_contents[item[3]] = item[2]
+        if item[5] and item[3] in seen_content:
+            stats["duplicate_content"] += 1
+            continue
+        seen_content.add(item[3])
+        stats["kept"] += 1
+        yield item
+    print(f"[Merge] Kept {stats['kept']} questions; dropped {stats['duplicate_numbers']} repeated numbers "
+          f"and {stats['duplicate_content']} repeated questions; {stats['conflicts']} conflicts.")
+
+
+def _adopt_part(part, package, adopted):
+    """Rename a part brought over from another document, and the parts it relates to, to unused part names."""
+    if id(part) in adopted:
+        return
+    adopted.add(id(part))
+    template = PARTNAME_NUMBER.sub(r'%d\1', part.partname.replace("%", "%%"), count=1)
+    part.partname = PackURI(package.next_partname(template))
+    for rel in part.rels.values():
+        if not rel.is_external:
+            _adopt_part(rel.target_part, package, adopted)
+
+
+def _import_relationships(element, src_part, dest_part, adopted):
+    """Re-point every relationship an element moved between documents refers to at the destination.
+
+    Images are added through the destination's image store, so repeated
+    images are kept once; charts, embedded objects, diagrams and other parts
+    are copied with the parts they depend on.
+    """
+    for node in element.iter():
+        for attr, r_id in node.attrib.items():
+            if not attr.startswith(RELATIONSHIP_PREFIX) or r_id not in src_part.rels:
+                continue
+            rel = src_part.rels[r_id]
+            if rel.is_external:
+                node.set(attr, dest_part.relate_to(rel.target_ref, rel.reltype, is_external=True))
+            elif hasattr(rel.target_part, "image"):
+                new_id, _ = dest_part.get_or_add_image(io.BytesIO(rel.target_part.blob))
+                node.set(attr, new_id)
+            else:
+                node.set(attr, dest_part.relate_to(rel.target_part, rel.reltype))
+                _adopt_part(rel.target_part, dest_part.package, adopted)
+
+
+def merge_docx(paths, output_path, links=None):
+    """Merge generated Word documents into one, keeping the first document's title, styles and layout.
+
+    ``links`` are the exam's link CSVs, used to recover real topic numbers.
+    """
+    topics_by_number = link_topics(links) if links else None
+    docs = [Document(path) for path in paths]
+    sources = [docx_questions(doc, i, topics_by_number) for i, doc in enumerate(docs)]
+    dest = docs[0]
+    adopted = set()
+    body = dest.element.body
+    preamble, _, sect_pr = extract_question_elements(dest)
+    for element in list(body.iterchildren()):
+        body.remove(element)
+    for element in preamble:
+        body.append(element)
+
+    for _, _, source, _, elements, _ in merge_sorted(sources):
+        for element in elements:
+            if source:
+                _import_relationships(element, docs[source].part, dest.part, adopted)
+            body.append(element)
+    if sect_pr is not None:
+        body.append(sect_pr)
+    dest.save(output_path)
+    QuestionIndex(output_path, question_entries(list(body.iterchildren()), topics_by_number)).save()
+
+
+def merge_json(paths, output_path, links=None):
+    """Merge question banks into one pretty JSON array.
+
+    Each bank is sorted in memory; the merged records are written through
+    JSON Lines, so the output is never built as one list.
+    """
+    sources = []
+    for i, path in enumerate(paths):
+        sources.append(json_questions(path, i, offset=sum(len(items) for items in sources)))
+    jsonl_path = os.path.splitext(output_path)[0] + ".merge.jsonl"
+    with JsonlWriter(jsonl_path) as writer:
+        for item in merge_sorted(sources):
+            writer.write(item[4])
+    jsonl_to_json(jsonl_path, output_path)
+    os.remove(jsonl_path)
+
+
+MERGERS = {
+    ".docx": merge_docx,
+    ".json": merge_json,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge question documents or JSON banks by (topic, question)")
+    parser.add_argument("output", help="Merged .docx or .json file")
+    parser.add_argument("inputs", nargs="+", help="Inputs of the same type as the output; earlier ones win ties")
+    parser.add_argument("--links", action="append", help="The exam's link CSV, to recover topic numbers (repeatable)")
+    args = parser.parse_args()
+
+    kind = os.path.splitext(args.output)[1].lower()
+    if kind not in MERGERS:
+        parser.error(f"output must be one of {', '.join(MERGERS)}")
+    mismatched = [path for path in args.inputs if os.path.splitext(path)[1].lower() != kind]
+    if mismatched:
+        parser.error(f"inputs must all be {kind} files: {', '.join(mismatched)}")
+    MERGERS[kind](args.inputs, args.output, links=args.links)
+    print(f"[Merge] Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
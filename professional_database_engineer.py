@@ -5,25 +5,40 @@ from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from docx import Document
-import json
+from selenium.common.exceptions import TimeoutException
+from browser_profiles import apply_lean_options, enable_request_blocking
+from html_archive import HtmlArchive
+from jsonl_writer import JsonlWriter, jsonl_to_json
+from question_records import heading_numbers, question_heading
+from question_urls import build_url_index
+from render_docx import render_with_xml_template
 import time
 
+LEAN_PROFILE = True  # block images/fonts/ads, eager page loads, persistent profile cache
+
 # Setup Microsoft Edge
 options = EdgeOptions()
 options.add_argument("--disable-blink-features=AutomationControlled")
+if LEAN_PROFILE:
+    apply_lean_options(options, profile_dir=".browser_profile/edge")
 service = EdgeService("./msedgedriver.exe")  # <-- Update this path if needed
 driver = webdriver.Edge(service=service, options=options)
+if LEAN_PROFILE:
+    enable_request_blocking(driver)
 
-# Word document
-doc = Document()
-doc.add_heading('Professional Cloud Database Engineer - Actual Exam Questions', 0)
+# (exam, topic, question) -> discussion URL from the crawled link CSVs
+EXAM_SLUG = "professional-cloud-database-engineer"
+url_index = build_url_index()
+archive = HtmlArchive(".question_archive")  # raw pages, for offline re-extraction with reparse.py
 
-# JSON list to store all questions
-all_questions = []
+# (heading, record) pairs; the Word document is rendered from them at the end
+word_items = []
 
-# Loop through questions
-for i in range(1, 132):  # <-- Change range if you want more questions
+# Questions are streamed to JSON Lines as they are scraped
+questions_jsonl = JsonlWriter("Professional_Database_Engineer_Questions.jsonl")
+
+# Find a question through Google: try the top 2 results for the right exam
+def search_question(i):
     query = f"professional database engineer examtopics question {i}"
     driver.get("https://www.google.com/")
 
@@ -60,17 +75,40 @@ for i in range(1, 132):  # <-- Change range if you want more questions
             driver.back()
             time.sleep(1)
 
+    return valid_question
+
+
+# Open a question's discussion page, straight from the URL index when it has it
+def open_question(i):
+    url = url_index.lookup(EXAM_SLUG, i)
+    if url:
+        driver.get(url)
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.CLASS_NAME, 'question-discussion-header'))
+            )
+            return True
+        except TimeoutException:
+            print(f"[Q{i}] Indexed page did not load, searching instead.")
+    return search_question(i)
+
+
+# Loop through questions
+for i in range(1, 132):  # <-- Change range if you want more questions
+    valid_question = open_question(i)
+
     if not valid_question:
         print(f"[Q{i}] Question not found in top 2 results.")
-        doc.add_paragraph(f"{i}", style='Heading 2')
-        doc.add_paragraph("Question not found.")
-        all_questions.append({
+        record = {
             "text": "Question not found.",
-            "examId": "profession-database-engineer",
+            "examId": "professional-cloud-database-engineer",
             "id": "",
             "options": [],
-            "explanation": ""
-        })
+            "explanation": "",
+            "question": i
+        }
+        questions_jsonl.write(record)
+        word_items.append((f"Question #: {i}", record))
         continue
 
     # Remove popup if exists
@@ -87,7 +125,7 @@ for i in range(1, 132):  # <-- Change range if you want more questions
             EC.presence_of_element_located((By.CLASS_NAME, 'discussion-header-container'))
         )
 
-        question_number = question_section.find_element(By.CSS_SELECTOR, '.question-discussion-header div').text.split('\n')[0]
+        question_number = question_heading(question_section.find_element(By.CSS_SELECTOR, '.question-discussion-header div').text)
         question = question_section.find_element(By.CLASS_NAME, 'question-body').find_element(By.TAG_NAME, 'p').text
 
         options = question_section.find_elements(By.CSS_SELECTOR, '.question-choices-container li')
@@ -106,17 +144,7 @@ for i in range(1, 132):  # <-- Change range if you want more questions
             answer = answer_element.text.strip()
         except:
             answer = "Correct Answer: Not found"
-
-        # Write to Word document
-        doc.add_paragraph(f"Question #: {question_number}", style='Heading 2')
-        doc.add_paragraph(f"Question: {question}", style='Normal')
-
-        doc.add_paragraph("Options:", style='Normal')
-        for opt in options_text:
-            doc.add_paragraph(opt, style='List Bullet')
-
-        doc.add_paragraph(f"Answer: {answer}", style='Normal')
-        doc.add_page_break()
+        archive.put(driver.current_url, EXAM_SLUG, driver.page_source, source="browser")
 
         # Build options properly
         formatted_options = []
@@ -133,25 +161,30 @@ for i in range(1, 132):  # <-- Change range if you want more questions
                 })
 
         # Append to JSON
-        all_questions.append({
+        record = {
             "text": question,
-            "examId": "profession-database-engineer",
+            "examId": "professional-cloud-database-engineer",
             "id": "",
             "options": formatted_options,
             "explanation": ""
-        })
+        }
+        record["question"], record["topic"] = heading_numbers(question_number)
+        questions_jsonl.write(record)
+        word_items.append((question_number, record))
 
     except Exception as e:
         print(f"Error on Question {i}: {e}")
 
     time.sleep(1)
 
-# Save Word file
-doc.save("Professional_Database_Engineer_Questions.docx")
+# Render the Word file from the records
+render_with_xml_template(word_items, "Professional_Database_Engineer_Questions.docx",
+                         "Professional Cloud Database Engineer - Actual Exam Questions")
 
 # Save JSON file
-with open("Professional_Database_Engineer_Questions.json", "w", encoding='utf-8') as f:
-    json.dump(all_questions, f, indent=4, ensure_ascii=False)
+questions_jsonl.close()
+jsonl_to_json("Professional_Database_Engineer_Questions.jsonl", "Professional_Database_Engineer_Questions.json")
 
 # Close browser
+archive.close()
 driver.quit()
@@ -0,0 +1,233 @@
+import argparse
+import hashlib
+import json
+import os
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+from question_records import QUESTION_PATTERN, TOPIC_PATTERN, question_fields
+
+INDEX_SUFFIX = ".idx"
+
+
+def paragraph_element_text(element):
+    """Text of a <w:p> element's runs, without building python-docx proxies."""
+    return "".join(t.text or "" for t in element.iter(qn('w:t')))
+
+
+def index_path(doc_path):
+    return doc_path + INDEX_SUFFIX
+
+
+def text_hash(texts):
+    """Change-detection hash of a question's paragraph texts (heading excluded), whitespace and case folded."""
+    text = " ".join(texts)
+    return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+def element_text_hash(elements):
+    return text_hash(paragraph_element_text(element) for element in elements)
+
+
+def question_topic(number, occurrences, topics_by_number=None, heading=""):
+    """Topic of the next "Question #: N" heading in a generated document.
+
+    Headings written since topics are recorded carry "Topic #: T". For older
+    documents the topic is guessed: questions are listed in link CSV order with
+    topics interleaved, so the k-th heading for N is the k-th topic that has a
+    question N, its number from ``topics_by_number`` if known, otherwise k. The
+    guess is only right for a complete run.
+    """
+    k = occurrences.get(number, 0)
+    occurrences[number] = k + 1
+    match = TOPIC_PATTERN.search(heading)
+    if match:
+        return int(match.group(1))
+    topics = (topics_by_number or {}).get(number, [])
+    return topics[k] if k < len(topics) else k + 1
+
+
+def index_entries(blocks, topics_by_number=None):
+    """Index entries from ``(is_paragraph, text)`` for each body element before the section properties."""
+    entries = []
+    occurrences = {}
+    for position, (is_paragraph, text) in enumerate(blocks):
+        match = QUESTION_PATTERN.match(text.strip()) if is_paragraph else None
+        if match:
+            if entries:
+                entries[-1]["end"] = position
+            number = int(match.group(1))
+            entries.append({"topic": question_topic(number, occurrences, topics_by_number, text),
+                            "number": number, "start": position, "end": len(blocks)})
+    for entry in entries:
+        entry["hash"] = text_hash(text for _, text in blocks[entry["start"] + 1:entry["end"]])
+    return entries
+
+
+def question_entries(children, topics_by_number=None):
+    """Index entries for a document body's child elements."""
+    blocks = []
+    for element in children:
+        if element.tag == qn('w:sectPr'):
+            break
+        blocks.append((element.tag == qn('w:p'), paragraph_element_text(element)))
+    return index_entries(blocks, topics_by_number)
+
+
+class QuestionIndex:
+    """Sidecar index of a generated Word document: where each question's body elements are, and a text hash.
+
+    ``entries`` are ``{"topic", "number", "start", "end", "hash"}`` dicts, where
+    start/end are positions among the document body's child elements. The
+    sidecar ("<doc>.docx.idx", JSON) records the document's size and mtime, so a
+    document edited elsewhere is re-indexed instead of trusted.
+    """
+
+    def __init__(self, doc_path, entries):
+        self.doc_path = doc_path
+        self.entries = entries
+
+    @classmethod
+    def build(cls, doc_path):
+        index = cls(doc_path, question_entries(list(Document(doc_path).element.body.iterchildren())))
+        index.save()
+        return index
+
+    @classmethod
+    def load(cls, doc_path):
+        """Read the sidecar, rebuilding it if it is missing or out of date."""
+        try:
+            with open(index_path(doc_path), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls.build(doc_path)
+        stat = os.stat(doc_path)
+        if data.get("size") != stat.st_size or data.get("mtime_ns") != stat.st_mtime_ns:
+            print(f"[Index] {doc_path} changed since it was indexed; rebuilding.")
+            return cls.build(doc_path)
+        return cls(doc_path, data["questions"])
+
+    def save(self):
+        stat = os.stat(self.doc_path)
+        data = {
+            "document": os.path.basename(self.doc_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "questions": self.entries,
+        }
+        tmp_path = index_path(self.doc_path) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, index_path(self.doc_path))
+
+    def lookup(self, number, topic=None):
+        """Entries for a question number (in one topic, if given), without opening the document."""
+        return [entry for entry in self.entries
+                if entry["number"] == number and (topic is None or entry["topic"] == topic)]
+
+    def select(self, first, last, topic=None):
+        return [entry for entry in self.entries
+                if first <= entry["number"] <= last and (topic is None or entry["topic"] == topic)]
+
+    def _open(self):
+        doc = Document(self.doc_path)
+        children = list(doc.element.body.iterchildren())
+        for entry in self.entries[:1] + self.entries[-1:]:
+            heading = paragraph_element_text(children[entry["start"]]).strip()
+            match = QUESTION_PATTERN.match(heading)
+            if not match or int(match.group(1)) != entry["number"]:
+                raise ValueError(f"{index_path(self.doc_path)} does not match {self.doc_path}; rebuild it")
+        return doc, children
+
+    def extract(self, entries, output_path):
+        """Write a document holding only the given questions (plus the title), and index it."""
+        doc, children = self._open()
+        body = doc.element.body
+        first_question = self.entries[0]["start"] if self.entries else len(children)
+        keep = children[:first_question]
+        for entry in entries:
+            keep += children[entry["start"]:entry["end"]]
+        for element in children:
+            if element.tag != qn('w:sectPr'):
+                body.remove(element)
+        sect_pr = body.find(qn('w:sectPr'))
+        for element in keep:
+            if sect_pr is not None:
+                sect_pr.addprevious(element)
+            else:
+                body.append(element)
+        doc.save(output_path)
+        return QuestionIndex.build(output_path)
+
+    def patch(self, entry, question_xml):
+        """Replace one question's elements with new WordprocessingML paragraphs, in place."""
+        doc, children = self._open()
+        new_elements = list(parse_xml(f"<w:body {nsdecls('w')}>{question_xml}</w:body>"))
+        old_elements = children[entry["start"]:entry["end"]]
+        for element in new_elements:
+            old_elements[0].addprevious(element)
+        for element in old_elements:
+            element.getparent().remove(element)
+        doc.save(self.doc_path)
+
+        shift = len(new_elements) - len(old_elements)
+        for other in self.entries:
+            if other["start"] > entry["start"]:
+                other["start"] += shift
+                other["end"] += shift
+        entry["end"] += shift
+        entry["hash"] = element_text_hash(new_elements[1:])
+        self.save()
+
+
+def main():
+    from render_docx import question_xml
+
+    parser = argparse.ArgumentParser(description="Random access to questions of a generated Word document")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="(Re)build the sidecar index")
+    build.add_argument("document")
+    lookup = sub.add_parser("lookup", help="Show where a question is")
+    lookup.add_argument("document")
+    lookup.add_argument("number", type=int)
+    extract = sub.add_parser("extract", help="Copy questions FIRST..LAST into a new document")
+    extract.add_argument("document")
+    extract.add_argument("first", type=int)
+    extract.add_argument("last", type=int)
+    extract.add_argument("output")
+    patch = sub.add_parser("patch", help="Replace one question with a JSON bank record")
+    patch.add_argument("document")
+    patch.add_argument("number", type=int)
+    patch.add_argument("record", help="JSON file holding one question record")
+    for command in (lookup, extract, patch):
+        command.add_argument("--topic", type=int, help="Only this topic")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = QuestionIndex.build(args.document)
+        print(f"[Index] {len(index.entries)} questions indexed in {index_path(args.document)}")
+        return
+    index = QuestionIndex.load(args.document)
+    if args.command == "lookup":
+        for entry in index.lookup(args.number, args.topic) or [None]:
+            print(f"[Index] {entry}" if entry else f"[Index] Question {args.number} not found.")
+    elif args.command == "extract":
+        entries = index.select(args.first, args.last, args.topic)
+        index.extract(entries, args.output)
+        print(f"[Index] {len(entries)} questions written to {args.output}")
+    elif args.command == "patch":
+        entries = index.lookup(args.number, args.topic)
+        if len(entries) != 1:
+            print(f"[Index] {len(entries)} questions numbered {args.number}; pick one with --topic.")
+            return
+        with open(args.record, encoding="utf-8") as f:
+            record = json.load(f)
+        heading = f"Question #: {args.number}"
+        index.patch(entries[0], question_xml(heading, *question_fields(record)))
+        print(f"[Index] Question {args.number} patched in {args.document}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import re
+
+QUESTION_PATTERN = re.compile(r'Question\s+#:\s+(\d+)')
+TOPIC_PATTERN = re.compile(r'Topic\s+#:\s*(\d+)')
+ANSWER_PATTERN = re.compile(r'[A-Z](?:[\s,]*[A-Z])*')
+
+
+def correct_option_letters(answer_text):
+    """Extract correct option letters from a 'Correct Answer: AB' style string; [] when there is no answer."""
+    answer = answer_text.split(":")[-1].strip()
+    if not ANSWER_PATTERN.fullmatch(answer):
+        return []  # "Not found", or an answer given only in prose
+    return re.findall(r'[A-Z]', answer)
+
+
+def question_heading(header_text):
+    """One-line Word heading for a page's "Question #: N" / "Topic #: T" header, keeping the topic."""
+    lines = [line.strip() for line in header_text.split("\n") if line.strip()]
+    heading = lines[0] if lines else ""
+    topic = TOPIC_PATTERN.search(header_text)
+    if topic and not TOPIC_PATTERN.search(heading):
+        heading = f"{heading} Topic #: {topic.group(1)}"
+    return heading
+
+
+def heading_numbers(heading):
+    """(question number, topic) from a "Question #: N Topic #: T" heading; None for either part it lacks."""
+    question = QUESTION_PATTERN.search(heading)
+    topic = TOPIC_PATTERN.search(heading)
+    return (int(question.group(1)) if question else None), (int(topic.group(1)) if topic else None)
+
+
+def record_heading(record):
+    """The Word heading for a bank record, or None if the record carries no question number."""
+    if record.get("question") is None:
+        return None
+    heading = f"Question #: {record['question']}"
+    if record.get("topic") is not None:
+        heading += f" Topic #: {record['topic']}"
+    return heading
+
+
+def build_question_json(question_text, options_text, correct_letters, exam_id, question=None, topic=None):
+    """Build the JSON record for one question in the bank's format, with its number and topic when known."""
+    options_json = []
+    for opt in options_text:
+        opt_id = opt[0]
+        clean_text = opt[3:].strip()
+        options_json.append({
+            "id": opt_id,
+            "isCorrect": opt_id in correct_letters,
+            "text": clean_text
+        })
+
+    record = {
+        "text": question_text,
+        "examId": exam_id,
+        "id": "",
+        "options": options_json,
+        "explanation": ""
+    }
+    if question is not None:
+        record["question"] = question
+    if topic is not None:
+        record["topic"] = topic
+    return record
+
+
+def question_fields(record):
+    """The (question_text, options_text, correct_letters) a bank record was built from."""
+    options_text = [f"{opt['id']}. {opt['text']}" for opt in record.get("options", [])]
+    correct_letters = [opt["id"] for opt in record.get("options", []) if opt.get("isCorrect")]
+    return record.get("text", ""), options_text, correct_letters
+
+
+def add_question_to_doc(doc, question_number, question_text, options_text, correct_letters):
+    """Append one question to a python-docx Document, bolding the correct options."""
+    doc.add_paragraph(question_number, style='Heading 2')
+    doc.add_paragraph(f"Q: {question_text}")
+    for opt in options_text:
+        opt_id = opt[0]
+        p = doc.add_paragraph(style='List Bullet')
+        run = p.add_run(opt)
+        if opt_id in correct_letters:
+            run.bold = True
+    doc.add_paragraph(f"Answer: {' '.join(correct_letters)}")
@@ -0,0 +1,76 @@
+import json
+import sqlite3
+import threading
+import time
+
+from link_index import discussion_view_id
+
+
+def discussion_key(url):
+    """Store key for a question URL: its discussion view id, or the URL itself if it has none."""
+    view_id = discussion_view_id(url)
+    return str(view_id) if view_id is not None else url
+
+
+class QuestionStore:
+    """Embedded SQLite store of scraped question fields and fetch status, keyed by discussion id.
+
+    Every result is committed as soon as it is scraped, so a crash loses nothing
+    and reruns only fetch URLs that are missing or previously failed.
+    """
+
+    def __init__(self, db_path="questions.sqlite"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            "discussion TEXT PRIMARY KEY, url TEXT, exam_id TEXT, status TEXT, "
+            "fields TEXT, error TEXT, attempts INTEGER DEFAULT 0, updated REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS questions_exam ON questions (exam_id, status)")
+        self._db.commit()
+
+    def pending(self, urls):
+        """URLs that have never been scraped or whose last attempt failed, in input order."""
+        with self._lock:
+            done = {row[0] for row in self._db.execute("SELECT discussion FROM questions WHERE status = 'ok'")}
+        return [url for url in urls if discussion_key(url) not in done]
+
+    def save_fields(self, url, exam_id, fields):
+        self._write(url, exam_id, "ok", json.dumps(list(fields), ensure_ascii=False), None)
+
+    def save_failure(self, url, exam_id, error):
+        self._write(url, exam_id, "failed", None, str(error))
+
+    def _write(self, url, exam_id, status, fields, error):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO questions (discussion, url, exam_id, status, fields, error, attempts, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT(discussion) DO UPDATE SET url = excluded.url, exam_id = excluded.exam_id, "
+                "status = excluded.status, fields = COALESCE(excluded.fields, questions.fields), "
+                "error = excluded.error, attempts = questions.attempts + 1, updated = excluded.updated",
+                (discussion_key(url), url, exam_id, status, fields, error, time.time()),
+            )
+            self._db.commit()
+
+    def fields_for(self, urls):
+        """(url, stored (question_number, question_text, options_text, answer_text)) for each scraped URL, in input order."""
+        with self._lock:
+            rows = dict(self._db.execute("SELECT discussion, fields FROM questions WHERE status = 'ok'"))
+        result = []
+        for url in urls:
+            fields = rows.get(discussion_key(url))
+            if fields is not None:
+                result.append((url, tuple(json.loads(fields))))
+        return result
+
+    def status_counts(self, exam_id):
+        with self._lock:
+            return dict(self._db.execute(
+                "SELECT status, COUNT(*) FROM questions WHERE exam_id = ? GROUP BY status", (exam_id,)
+            ))
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,66 @@
+import csv
+import glob
+import os
+import sqlite3
+
+from link_records import MISSING_QUESTION, parse_links
+
+
+class QuestionUrlIndex:
+    """In-memory ``(exam slug, topic, question) -> discussion URL`` map built from crawled links.
+
+    Sources are the per-exam link CSVs the listing crawler writes and, if
+    present, its SQLite link index. When a question has several discussions the
+    first one seen is kept.
+    """
+
+    def __init__(self):
+        self.urls = {}
+        self.collisions = 0
+
+    def add_links(self, links):
+        """Index a batch of discussion links; returns how many new questions were added."""
+        added = 0
+        for record in parse_links(links):
+            if record.exam is None or record.question == MISSING_QUESTION:
+                continue
+            key = (record.exam, record.topic, record.question)
+            if key in self.urls:
+                if self.urls[key] != record.url:
+                    self.collisions += 1
+                continue
+            self.urls[key] = record.url
+            added += 1
+        return added
+
+    def add_csv(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            return self.add_links([row[1] for row in csv.reader(f) if len(row) > 1 and row[1].startswith("http")])
+
+    def add_link_db(self, db_path):
+        db = sqlite3.connect(db_path)
+        try:
+            return self.add_links([row[0] for row in db.execute("SELECT url FROM links ORDER BY view_id")])
+        finally:
+            db.close()
+
+    def lookup(self, exam, question, topic=1):
+        """The discussion URL for a question, or None if it was never crawled."""
+        return self.urls.get((exam.lower(), topic, question))
+
+    def exams(self):
+        return sorted({exam for exam, _, _ in self.urls})
+
+    def __len__(self):
+        return len(self.urls)
+
+
+def build_url_index(csv_paths=None, link_db="examtopics_links.sqlite"):
+    """Index every link CSV in the working directory (or ``csv_paths``) plus the crawler's link DB."""
+    index = QuestionUrlIndex()
+    for path in sorted(glob.glob("*.csv")) if csv_paths is None else csv_paths:
+        index.add_csv(path)
+    if link_db and os.path.exists(link_db):
+        index.add_link_db(link_db)
+    print(f"[URL Index] {len(index)} questions across {len(index.exams())} exams.")
+    return index
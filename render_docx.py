@@ -0,0 +1,210 @@
+import argparse
+import glob
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from docx import Document
+
+from jsonl_writer import iter_json_array, iter_jsonl
+from question_index import QuestionIndex, index_entries
+from question_records import add_question_to_doc, question_fields, record_heading
+
+INVALID_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+BODY_PATTERN = re.compile(rb'<w:body>.*?(<w:sectPr\b.*</w:body>)', re.DOTALL)
+
+
+def load_questions(path):
+    """Yield question records from a JSON array or a JSON Lines file, streaming either.
+
+    Raises ValueError for files that are not question banks (the exam manifest,
+    a JSON object, an array of anything but question records).
+    """
+    records = iter_jsonl(path) if path.endswith(".jsonl") else iter_json_array(path)
+    for record in records:
+        if not isinstance(record, dict) or "text" not in record:
+            raise ValueError(f"{path} is not a question bank")
+        yield record
+
+
+def question_items(records, require_numbers=False):
+    """Pair each record with its "Question #: N Topic #: T" heading from the number stored in it.
+
+    Banks scraped before records carried their number fall back to numbering in
+    order, with a warning; with require_numbers such a bank raises ValueError instead.
+    """
+    warned = False
+    for position, record in enumerate(records, start=1):
+        heading = record_heading(record)
+        if heading is None:
+            if require_numbers:
+                raise ValueError("records carry no question numbers; rescrape it or render with --out-dir")
+            if not warned:
+                print("[Render] Bank records carry no question numbers; numbering them in order.")
+                warned = True
+            heading = f"Question #: {position}"
+        yield heading, record
+
+
+def render_with_python_docx(items, output_path, title):
+    """Reference renderer: python-docx paragraph/run calls."""
+    doc = Document()
+    doc.add_heading(title, 0)
+    count = 0
+    for heading, record in items:
+        question_text, options_text, correct_letters = question_fields(record)
+        add_question_to_doc(doc, heading, question_text, options_text, correct_letters)
+        count += 1
+    doc.save(output_path)
+    return count
+
+
+@lru_cache(maxsize=1)
+def _template():
+    """The default python-docx package, split into its other parts and the document.xml head/tail."""
+    buffer = io.BytesIO()
+    Document().save(buffer)
+    with zipfile.ZipFile(buffer) as package:
+        parts = [(info, package.read(info.filename)) for info in package.infolist()
+                 if info.filename != "word/document.xml"]
+        document_xml = package.read("word/document.xml")
+    match = BODY_PATTERN.search(document_xml)
+    head = document_xml[:match.start()] + b"<w:body>"
+    tail = document_xml[match.start(1):]
+    return parts, head, tail
+
+
+def _visible_text(text):
+    """The text a run's <w:t> elements hold once _run_xml has turned newlines and tabs into elements."""
+    return INVALID_XML_CHARS.sub("", text).replace("\n", "").replace("\t", "")
+
+
+def question_paragraphs(heading, question_text, options_text, correct_letters):
+    """(text, style, bold) for each paragraph of one question, matching question_records.add_question_to_doc."""
+    paragraphs = [(heading, "Heading2", False), (f"Q: {question_text}", None, False)]
+    for opt in options_text:
+        paragraphs.append((opt, "ListBullet", opt[:1] in correct_letters))
+    paragraphs.append((f"Answer: {' '.join(correct_letters)}", None, False))
+    return paragraphs
+
+
+def _run_xml(text, bold=False):
+    text = INVALID_XML_CHARS.sub("", text)
+    pieces = []
+    for i, line in enumerate(text.split("\n")):
+        if i:
+            pieces.append("<w:br/>")
+        for j, chunk in enumerate(line.split("\t")):
+            if j:
+                pieces.append("<w:tab/>")
+            if chunk:
+                pieces.append(f'<w:t xml:space="preserve">{escape(chunk)}</w:t>')
+    props = "<w:rPr><w:b/></w:rPr>" if bold else ""
+    return f"<w:r>{props}{''.join(pieces)}</w:r>"
+
+
+def _paragraph_xml(text, style=None, bold=False):
+    props = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f"<w:p>{props}{_run_xml(text, bold)}</w:p>"
+
+
+def question_xml(heading, question_text, options_text, correct_letters):
+    """WordprocessingML for one question."""
+    paragraphs = question_paragraphs(heading, question_text, options_text, correct_letters)
+    return "".join(_paragraph_xml(*paragraph) for paragraph in paragraphs)
+
+
+def render_with_xml_template(items, output_path, title):
+    """Fast renderer: stream question XML straight into the default template's document.xml.
+
+    The sidecar question index is built from the same paragraphs as they are written.
+    """
+    parts, head, tail = _template()
+    count = 0
+    blocks = [(True, _visible_text(title))]
+    tmp_path = output_path + ".tmp"
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as package:
+            for info, data in parts:
+                package.writestr(info, data)
+            with package.open("word/document.xml", "w") as body:
+                body.write(head)
+                body.write(_paragraph_xml(title, "Title").encode("utf-8"))
+                for heading, record in items:
+                    paragraphs = question_paragraphs(heading, *question_fields(record))
+                    body.write("".join(_paragraph_xml(*paragraph) for paragraph in paragraphs).encode("utf-8"))
+                    blocks += [(True, _visible_text(text)) for text, _, _ in paragraphs]
+                    count += 1
+                body.write(tail)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    QuestionIndex(output_path, index_entries(blocks)).save()
+    return count
+
+
+ENGINES = {
+    "fast": render_with_xml_template,
+    "docx": render_with_python_docx,
+}
+
+
+def default_title(path):
+    return f"{os.path.splitext(os.path.basename(path))[0]} Actual Exam Questions"
+
+
+def render_bank(json_path, output_path=None, title=None, engine="fast"):
+    """Render one question bank (.json or .jsonl) to .docx; returns (output path, question count).
+
+    Without an output path the bank's own .docx is replaced, so every record must carry its number.
+    """
+    in_place = output_path is None
+    output_path = output_path or os.path.splitext(json_path)[0] + ".docx"
+    items = question_items(load_questions(json_path), require_numbers=in_place)
+    count = ENGINES[engine](items, output_path, title or default_title(json_path))
+    return output_path, count
+
+
+def render_banks(json_paths, engine="fast", out_dir=None, workers=None):
+    """Render many banks in parallel, one per worker process; files that are not banks are skipped."""
+    jobs = []
+    for path in json_paths:
+        output_path = None
+        if out_dir:
+            output_path = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + ".docx")
+        jobs.append((path, output_path, None, engine))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(render_bank, *job): job[0] for job in jobs}
+        for future in as_completed(futures):
+            try:
+                output_path, count = future.result()
+            except ValueError as e:
+                print(f"[Render] Skipped {futures[future]}: {e}")
+                continue
+            print(f"[Render] {output_path}: {count} questions.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render question JSON banks to Word documents")
+    parser.add_argument("banks", nargs="*", help="Question .json/.jsonl files (default: every *.json here)")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="fast", help="Renderer backend")
+    parser.add_argument("--out-dir", default="rendered", help="Directory for the .docx files (default: rendered)")
+    parser.add_argument("--in-place", action="store_true",
+                        help="Write each .docx next to its bank, replacing the scraped document")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+
+    banks = args.banks or sorted(glob.glob("*.json"))
+    out_dir = None if args.in_place else args.out_dir
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    render_banks(banks, engine=args.engine, out_dir=out_dir, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
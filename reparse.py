@@ -0,0 +1,88 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from tqdm import tqdm
+
+import scrap_from_csv_make_json_word as extractor
+from batch_extract import exam_outputs, load_manifest
+from dedup import dedup_urls
+from html_archive import HtmlArchive, parse_archived_page
+from question_store import QuestionStore, discussion_key
+
+
+def reparse(archive, store, exams, workers=None):
+    """Re-extract every archived page of ``exams`` into the store, offline, on a process pool.
+
+    Pages with identical bodies are parsed once. A page that no longer parses
+    leaves its stored fields untouched, so a parser regression never removes
+    questions from the export; it is reported in the returned failures instead.
+    Returns (``exam_id -> CSV urls`` for the export step, [(url, exam_id, error)]).
+    """
+    exam_urls = {}
+    targets = {}
+    for exam in exams:
+        urls = dedup_urls(extractor.read_urls(exam["csv"]))
+        exam_urls[exam["exam_id"]] = urls
+        pages = archive.pages(exam["exam_id"])
+        missing = 0
+        for url in urls:
+            digest = pages.get(discussion_key(url))
+            if digest is None:
+                missing += 1
+                continue
+            targets.setdefault(digest, []).append((url, exam["exam_id"]))
+        if missing:
+            print(f"[Reparse] {exam['name']}: {missing} pages not archived; scrape them with batch_extract.py.")
+
+    digests = list(targets)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(digests) // (workers * 4))
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(parse_archived_page, [archive.root] * len(digests), digests, chunksize=chunksize)
+        for digest, fields, error in tqdm(results, total=len(digests), desc="Reparsing", unit="page"):
+            for url, exam_id in targets[digest]:
+                if fields is not None:
+                    store.save_fields(url, exam_id, fields)
+                else:
+                    failures.append((url, exam_id, error))
+    print(f"[Reparse] {len(digests)} archived pages parsed, {len(failures)} questions failed to parse.")
+    return exam_urls, failures
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Re-extract questions from the raw-HTML archive and re-export")
+    parser.add_argument("--manifest", default="exam_manifest.json", help="JSON manifest of CSV files and exam ids")
+    parser.add_argument("--exam", action="append", help="Only reparse this exam id (repeatable)")
+    parser.add_argument("--archive", default=extractor.ARCHIVE_DIR, help="Raw-HTML archive directory")
+    parser.add_argument("--store", default=extractor.STORE_PATH, help="SQLite question store")
+    parser.add_argument("--out-dir", default=".", help="Directory for the JSON and Word outputs")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    _, exams = load_manifest(args.manifest, args.exam)
+    if not exams:
+        print("[Reparse] No exams to process.")
+        return
+    os.makedirs(args.out_dir, exist_ok=True)
+    archive = HtmlArchive(args.archive)
+    store = QuestionStore(args.store)
+    exam_urls, failures = reparse(archive, store, exams, workers=args.workers)
+    for url, exam_id, error in failures:
+        print(f"[Reparse] {exam_id}: kept previous fields for {url} ({error})")
+    for exam in exams:
+        count = extractor.export_from_store(store, exam_urls[exam["exam_id"]], exam["exam_id"],
+                                            **exam_outputs(exam, args.out_dir))
+        print(f"[Reparse] {exam['name']}: {count} questions exported.")
+    extractor.deduper.save()
+    store.close()
+    archive.close()
+    print("[Reparse] Done. ✅")
+
+
+if __name__ == "__main__":
+    main()
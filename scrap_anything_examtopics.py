@@ -1,90 +1,304 @@
+import argparse
+import logging
+import os
+import time
 import requests
-import pandas as pd
-from bs4 import BeautifulSoup
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
+from functools import lru_cache
+from crawl_journal import CrawlJournal
+from crawl_metrics import CrawlMetrics
+from dedup import dedup_urls
+from transport import CircuitBreaker, configure_session
+from listing_parsers import BACKENDS, get_listing_parser
+from link_index import LinkIndex, discussion_view_id
+from link_writers import WRITERS, RowSpool, write_exam_files
+from link_records import parse_link, parse_links, sort_key
+
+logger = logging.getLogger(__name__)
+
+
+class ExamFilter:
+    """Match discussion links against a set of exam codes with one precompiled pattern."""
+
+    def __init__(self, exam_codes):
+        self.exam_codes = frozenset(code.strip().lower() for code in exam_codes if code.strip())
+        alternatives = "|".join(re.escape(code) for code in sorted(self.exam_codes, key=len, reverse=True))
+        self.pattern = re.compile(rf'exam-({alternatives})-topic')
+
+    def match(self, link):
+        """Return the exam code a link belongs to, or None if it is not one of ours."""
+        match = self.pattern.search(link)
+        return match.group(1) if match else None
+
+
+@lru_cache(maxsize=32)
+def exam_filter_for(search_string):
+    """Build the ExamFilter for a comma-separated list of exam codes (None means keep everything)."""
+    if not search_string or not search_string.strip():
+        return None
+    return ExamFilter(search_string.split(","))
+
+
+def build_session(cache_dir=None, offline=False, concurrency=10, cache_fresh_for=0):
+    """A pooled, retrying session, backed by the on-disk HTTP cache when cache_dir is set."""
+    if cache_dir:
+        from http_cache import HttpCache, CachedSession
+        session = CachedSession(HttpCache(cache_dir, fresh_for=cache_fresh_for), offline=offline)
+    else:
+        session = requests.Session()
+    return configure_session(session, pool_size=concurrency)
+
 
 class Scraper:
-    def __init__(self, provider):
-        self.session = requests.Session()
+    def __init__(self, provider, engine="threads", cache_dir=None, offline=False, concurrency=10, retry_rounds=2,
+                 parser="auto", cache_fresh_for=0, session=None):
+        # A caller-supplied session is shared and stays the caller's to close
+        self.session = session or build_session(cache_dir, offline, concurrency, cache_fresh_for)
+        self.breaker = CircuitBreaker()
+        self.rate_limiter = None
+        self.metrics = CrawlMetrics()
+        self.parser = get_listing_parser(parser)
         self.provider = provider.lower()
+        self.engine = engine
+        self.concurrency = concurrency
+        self.retry_rounds = retry_rounds
+        self.failed_pages = []
         self.base_url = f"https://www.examtopics.com/discussions/{self.provider}/"
         print(f"[Init] Scraper initialized for provider: {self.provider}")
 
+    def close(self):
+        self.session.close()
+
     def get_num_pages(self):
         """Retrieve the number of pages for the provider."""
         print(f"[Get Pages] Fetching total number of discussion pages for provider: {self.provider}")
         try:
             response = self.session.get(f"{self.base_url}")
-            soup = BeautifulSoup(response.content, "html.parser")
-            total_pages = int(soup.find("span", {"class": "discussion-list-page-indicator"}).find_all("strong")[1].text.strip())
+            total_pages = self.parser.num_pages(response.content)
+            if total_pages is None:
+                raise ValueError("page indicator not found")
             print(f"[Get Pages] Total pages found: {total_pages}")
             return total_pages
         except Exception as e:
             print(f"[Get Pages] Error fetching page count: {e}")
             return 0
 
-    def fetch_page_links(self, page, search_string):
-        """Fetch links from a single page."""
-        print(f"[Fetch Links] Fetching page {page}...")
+    def fetch_page_links(self, page, search_string, sinks=None, revalidate=False):
+        """Fetch links from a single page, or None if the page could not be fetched.
+
+        ``revalidate`` asks the origin even when the cached copy is still fresh.
+        """
+        logger.debug("[Fetch Links] Fetching page %s...", page)
+        self.breaker.wait()
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.base_url)
+        options = {"revalidate": True} if revalidate and hasattr(self.session, "cache") else {}
+        start = time.perf_counter()
         try:
-            response = self.session.get(f"{self.base_url}{page}/")
-            soup = BeautifulSoup(response.content, "html.parser")
-            discussions = soup.find_all("a", {"class": "discussion-link"})
-            links = []
-            for discussion in discussions:
-                # if search_string in discussion.text:
-                    full_link = discussion["href"].replace("/discussions", "https://www.examtopics.com/discussions", 1)
-                    links.append(full_link)
-                    print(f"[Link Found] {full_link}")  # <== PRINT EACH LINK HERE
-            print(f"[Fetch Links] Page {page}: Found {len(links)} matching links.")
-            return links
+            response = self.session.get(f"{self.base_url}{page}/", **options)
+            response.raise_for_status()
         except Exception as e:
             print(f"[Fetch Links] Error on page {page}: {e}")
-            return []
+            response = getattr(e, "response", None)
+            self.metrics.record_error(f"HTTP {response.status_code}" if response is not None else type(e).__name__)
+            self.breaker.record(False)
+            self.failed_pages.append(page)
+            return None
+        if getattr(response, "from_cache", False):
+            self.metrics.observe_cache_hit()
+        else:
+            self.metrics.observe_request(time.perf_counter() - start, len(response.content))
+        self.breaker.record(True)
+        return self.try_parse_page_links(response.content, page, search_string, sinks)
+
+    def parse_page_links(self, content, page, search_string, sinks=None):
+        """Extract discussion links from the HTML of a listing page.
 
-    def get_discussion_links(self, num_pages, search_string):
-        """Retrieve discussion links that include the search string, using parallel requests."""
+        ``search_string`` holds comma-separated exam codes; only links for those exams
+        are kept. When ``sinks`` is given, each kept link is also appended to
+        ``sinks[exam_code]`` as it is parsed.
+        """
+        start = time.perf_counter()
+        exam_filter = exam_filter_for(search_string)
+        links = []
+        for href in self.parser.links(content):
+            exam = exam_filter.match(href) if exam_filter else None
+            if exam_filter and exam is None:
+                continue
+            full_link = href.replace("/discussions", "https://www.examtopics.com/discussions", 1)
+            links.append(full_link)
+            if sinks is not None:
+                sinks.setdefault(exam, []).append(full_link)
+            logger.debug("[Link Found] %s", full_link)
+        self.metrics.observe_parse(time.perf_counter() - start, len(links))
+        logger.info("[Fetch Links] Page %s: Found %d matching links.", page, len(links))
+        return links
+
+    def try_parse_page_links(self, content, page, search_string, sinks=None):
+        """parse_page_links, but an unparseable page (e.g. an empty body) is recorded as failed and gives None."""
+        try:
+            return self.parse_page_links(content, page, search_string, sinks)
+        except Exception as e:
+            print(f"[Fetch Links] Could not parse page {page}: {e}")
+            self.metrics.record_error(f"parse {type(e).__name__}")
+            # Drop the cached copy, or a revalidation would replay the same body on retry
+            cache = getattr(self.session, "cache", None)
+            if cache is not None:
+                cache.delete(f"{self.base_url}{page}/")
+            self.failed_pages.append(page)
+            return None
+
+    def pages_to_fetch(self, num_pages, search_string, links, sinks, journal):
+        """Replay pages already completed in the journal and return the ones still to fetch.
+
+        The listing is newest first, so discussions posted since the interrupted
+        run push links from each page onto the next. Completed pages that follow
+        a pending page (and page 1) are fetched again; the repeats this causes are
+        dropped by view id when the links are written. Links pushed more than one
+        page onto a completed page are still missed; run ``--incremental``
+        afterwards, or crawl from scratch, if many discussions were added meanwhile.
+        """
+        if journal is None:
+            return list(range(1, num_pages + 1))
+        done = journal.completed_pages()
+        boundary = {page for page in done if page - 1 not in done}
+        replayed = journal.links(exclude=boundary)
+        if sinks is None:
+            links.extend(replayed)
+        else:
+            route_links_to_sinks(replayed, search_string, sinks)
+        print(f"[Discussion Links] Skipping {len(done) - len(boundary)} pages completed in a previous run "
+              f"(re-fetching {len(boundary)} boundary pages).")
+        return [page for page in range(1, num_pages + 1) if page not in done or page in boundary]
+
+    def get_discussion_links(self, num_pages, search_string, sinks=None, journal=None):
+        """Retrieve discussion links for the exam codes in the search string, using parallel requests.
+
+        Returns a flat list of links, or, when ``sinks`` is given, fills it with
+        ``exam_code -> links`` as pages are parsed and returns it instead. With a
+        ``journal``, finished pages are recorded as they complete and pages from a
+        previous run are replayed instead of fetched again. Pages that fail are
+        queued and retried for up to ``retry_rounds`` more passes; any still
+        failing are left in ``self.failed_pages``.
+        """
         print(f"[Discussion Links] Starting to fetch links from {num_pages} pages...")
+        self.metrics.start()
         links = []
+        pages = self.pages_to_fetch(num_pages, search_string, links, sinks, journal)
+        found = 0
+
+        for attempt in range(self.retry_rounds + 1):
+            if attempt:
+                pause = max(self.breaker.remaining_pause(), 2 ** attempt)
+                print(f"[Discussion Links] Retrying {len(pages)} failed pages in {pause:.0f}s...")
+                time.sleep(pause)
+            self.failed_pages = []
+            if self.engine == "async":
+                found += self._crawl_async(pages, search_string, links, sinks, journal)
+            else:
+                found += self._crawl_threads(pages, search_string, links, sinks, journal)
+            pages = sorted(self.failed_pages)
+            if not pages:
+                break
 
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(self.fetch_page_links, page, search_string) for page in range(1, num_pages + 1)]
-            with tqdm(total=num_pages, desc="Fetching Links", unit="page") as pbar:
+        if self.failed_pages:
+            print(f"[Discussion Links] {len(self.failed_pages)} pages still failing: {sorted(self.failed_pages)}")
+        print(f"[Discussion Links] Total matching links found: {found}")
+        return links if sinks is None else sinks
+
+    def _record_page(self, page, page_links, links, sinks, journal):
+        if sinks is None:
+            links.extend(page_links)
+        if journal is not None:
+            journal.record_page(page, page_links)
+        return len(page_links)
+
+    def _crawl_threads(self, pages, search_string, links, sinks, journal):
+        found = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(self.fetch_page_links, page, search_string, sinks): page for page in pages}
+            with tqdm(total=len(pages), desc="Fetching Links", unit="page") as pbar:
                 for future in as_completed(futures):
                     page_links = future.result()
-                    links.extend(page_links)
+                    if page_links is not None:
+                        found += self._record_page(futures[future], page_links, links, sinks, journal)
                     pbar.update(1)
-        print(f"[Discussion Links] Total matching links found: {len(links)}")
-        return links
+        return found
+
+    def _crawl_async(self, pages, search_string, links, sinks, journal):
+        """Same as _crawl_threads, but on an asyncio engine with adaptive concurrency."""
+        from async_engine import AsyncCrawler
+
+        found = 0
+        with tqdm(total=len(pages), desc="Fetching Links", unit="page") as pbar:
+            def on_page(page, body):
+                nonlocal found
+                if body is None:
+                    self.failed_pages.append(page)
+                else:
+                    page_links = self.try_parse_page_links(body, page, search_string, sinks)
+                    if page_links is not None:
+                        found += self._record_page(page, page_links, links, sinks, journal)
+                pbar.update(1)
+
+            AsyncCrawler(self, initial=self.concurrency).run(pages, on_page)
+        return found
+
+    def get_new_discussion_links(self, num_pages, search_string, index):
+        """Incremental crawl: walk pages newest first and stop at the first page with only known links.
+
+        A page that still fails after ``retry_rounds`` retries aborts the walk
+        without recording anything, since later pages' links would make the
+        next run stop before reaching it.
+        """
+        print(f"[Incremental] Walking up to {num_pages} pages until known discussions are reached...")
+        self.metrics.start()
+        new_links = []
+        self.failed_pages = []
+        for page in range(1, num_pages + 1):
+            # The stop condition needs every id on the page, so exam filtering happens after the walk;
+            # a cached copy of a listing page may predate new discussions, so always revalidate
+            page_links = self.fetch_page_links(page, None, revalidate=True)
+            for attempt in range(1, self.retry_rounds + 1):
+                if page_links is not None:
+                    break
+                pause = max(self.breaker.remaining_pause(), 2 ** attempt)
+                print(f"[Incremental] Retrying page {page} in {pause:.0f}s...")
+                time.sleep(pause)
+                page_links = self.fetch_page_links(page, None, revalidate=True)
+            if page_links is None:
+                print(f"[Incremental] Page {page} is still failing; nothing recorded, rerun later.")
+                return []
+            self.failed_pages = []
+            ids = {discussion_view_id(link) for link in page_links} - {None}
+            known = index.known_ids(ids)
+            new_links.extend(link for link in page_links if discussion_view_id(link) not in known)
+            if ids and known == ids:
+                print(f"[Incremental] Page {page} contains only known discussions, stopping.")
+                break
+        # Only record links once the walk has finished, so an interrupted run is redone next time
+        index.add_links(self.provider, new_links)
+        print(f"[Incremental] {len(new_links)} new links found.")
+        exam_filter = exam_filter_for(search_string)
+        if exam_filter is None:
+            return new_links
+        return [link for link in new_links if exam_filter.match(link)]
 
 def extract_topic_question(link):
     """Extract topic and question numbers from a link."""
-    match = re.search(r'topic-(\d+)-question-(\d+)', link)
-    if match:
-        topic = int(match.group(1))
-        question = int(match.group(2))
-        return (topic, question)
-    else:
-        match_topic_only = re.search(r'topic-(\d+)-question/?$', link)
-        if match_topic_only:
-            topic = int(match_topic_only.group(1))
-            # Assign question 9999 for links without a question number
-            return (topic, 9999)
-        else:
-            return (None, None)
+    record = parse_link(link)
+    if record is None:
+        return (None, None)
+    return record.key
 
 def write_grouped_links_to_file(filename, links):
     """Write the grouped links to a file."""
     print(f"[Write File] Grouping and writing links to file: {filename}")
     grouped_links = {}
-    # Filter out links where extract_topic_question returns None for topic
-    valid_links = [link for link in links if extract_topic_question(link)[0] is not None]  
-    for link in sorted(valid_links, key=extract_topic_question):
-        topic, question = extract_topic_question(link)
-        if topic is not None:
-            grouped_links.setdefault(topic, []).append(link)
+    for record in sorted(parse_links(links), key=sort_key):
+        grouped_links.setdefault(record.topic, []).append(record.url)
 
     with open(filename, 'w') as f:
         for topic, links in grouped_links.items():
@@ -96,47 +310,105 @@ def write_grouped_links_to_file(filename, links):
     print(f"[Write File] All links written successfully to {filename}.")
 
 
-def write_grouped_links_to_excels(links):
-    """Write links into separate Excel files per exam."""
-    print(f"[Write Excel] Grouping and writing links to Excel files...")
-    exam_links = {}
-
-    # First, group links by exam
+def route_links_to_sinks(links, search_string, sinks):
+    """Append already-fetched links to per-exam sinks, keeping only the requested exams."""
+    exam_filter = exam_filter_for(search_string)
     for link in links:
-        exam_match = re.search(r'exam-([a-z0-9\-]+)-topic', link)
-        topic_question = extract_topic_question(link)
+        exam = exam_filter.match(link) if exam_filter else None
+        if exam_filter is None or exam is not None:
+            sinks.setdefault(exam, []).append(link)
+    return sinks
 
-        if exam_match and topic_question[0] is not None:
-            exam_name = exam_match.group(1)
-            exam_links.setdefault(exam_name, []).append((topic_question[1], link))
 
-    # Now write each exam's links into separate Excel files
-    for exam_name, questions in exam_links.items():
-        questions_sorted = sorted(questions, key=lambda x: x[0])  # Sort by question number
-        df = pd.DataFrame(questions_sorted, columns=["Question Number", "Link"])
-        file_name = f"{exam_name}.xlsx"
-        df.to_excel(file_name, index=False)
-        print(f"[Write Excel] {file_name} created with {len(questions)} questions.")
+def write_grouped_links_to_excels(links, fmt="xlsx", workers=None, out_dir="."):
+    """Write links into separate Excel (or CSV/Parquet) files per exam, exams in parallel.
 
-    print("[Write Excel] All Excel files created successfully ✅.")
+    ``links`` is either a flat list of links or the ``exam_code -> links`` sinks
+    filled by a filtered crawl; links in the unfiltered ``None`` sink are grouped
+    by the exam name in their URL.
+    """
+    print(f"[Write Excel] Grouping and writing links to Excel files...")
 
+    # Rows are spooled to a temporary SQLite file as they are parsed; the writers stream them back sorted
+    spool = RowSpool()
+    try:
+        if isinstance(links, dict):
+            for exam_name, sink_links in links.items():
+                if exam_name is not None:
+                    spool.add((exam_name, q.question, q.url) for q in map(parse_link, dedup_urls(sink_links))
+                              if q is not None)
+            ungrouped = links.get(None, [])
+        else:
+            ungrouped = links
+        spool.add((q.exam, q.question, q.url) for q in map(parse_link, dedup_urls(ungrouped))
+                  if q is not None and q.exam is not None)
+        write_exam_files(spool, fmt=fmt, out_dir=out_dir, workers=workers)
+    finally:
+        spool.close()
 
-def main():
-    print("========== ExamTopics Discussion Scraper ==========")
-    provider = input("Enter provider name (e.g., google, aws, etc.): ")
-    scraper = Scraper(provider)
+    print(f"[Write Excel] All {fmt} files created successfully ✅.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="ExamTopics discussion link scraper")
+    parser.add_argument("--engine", choices=["threads", "async"], default="threads", help="Crawl engine")
+    parser.add_argument("--cache-dir", default=".examtopics_cache", help="On-disk HTTP cache ('' to disable)")
+    parser.add_argument("--offline", action="store_true", help="Replay only from the HTTP cache, no network")
+    parser.add_argument("--cache-fresh-for", type=int, default=0,
+                        help="Serve cached pages younger than this many seconds without revalidating (default 0)")
+    parser.add_argument("--index-db", default="examtopics_links.sqlite", help="SQLite index of known discussion links")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fetch pages until the first page of already-known discussions")
+    parser.add_argument("--parser", choices=["auto"] + sorted(BACKENDS), default="auto",
+                        help="Listing page HTML extraction backend")
+    parser.add_argument("--concurrency", type=int, default=10, help="Parallel listing page requests")
+    parser.add_argument("--journal-dir", default=".examtopics_journal", help="Where crawl journals are kept")
+    parser.add_argument("--resume", action="store_true", help="Skip pages completed by an interrupted crawl")
+    parser.add_argument("--metrics-json", help="Write a JSON crawl metrics summary to this file")
+    parser.add_argument("--metrics-prom", help="Write Prometheus text-format crawl metrics to this file")
+    parser.add_argument("--log-level", default="WARNING",
+                        help="DEBUG prints every link found, INFO prints per-page counts")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="xlsx", help="Per-exam output file format")
+    parser.add_argument("--workers", type=int, default=None, help="Processes used to write exam files")
+    return parser.parse_args()
 
+
+def run(args, scraper, provider):
+    """Interactive crawl of one provider, from the page count to the per-exam files."""
     num_pages = scraper.get_num_pages()
     print(f"[Main] Total Pages for {provider}: {num_pages}")
 
     if num_pages > 0:
-        search_string = input("Enter exam code (e.g., PROFESSIONAL-DATABASE-ENGINEER) or 'QUIT' to exit: ").upper()
+        search_string = input("Enter exam codes, comma-separated (e.g., AZ-104,AZ-305), blank for all, or 'QUIT' to exit: ").upper()
         if search_string != 'QUIT':
-            links = scraper.get_discussion_links(num_pages, search_string)
-            print(f"[Main] Total links matching '{search_string}': {len(links)}")
+            index = LinkIndex(args.index_db)
+            links = {}
+            if args.incremental:
+                scraper.get_new_discussion_links(num_pages, search_string, index)
+                route_links_to_sinks(index.links(scraper.provider), search_string, links)
+                journal = None
+            else:
+                journal_path = os.path.join(args.journal_dir, f"{scraper.provider}.jsonl")
+                journal = CrawlJournal(journal_path, scraper.provider, search_string, resume=args.resume)
+                try:
+                    scraper.get_discussion_links(num_pages, search_string, sinks=links, journal=journal)
+                finally:
+                    journal.close()
+                for sink_links in links.values():
+                    index.add_links(scraper.provider, sink_links)
+            index.close()
+            scraper.metrics.report(args.metrics_json, args.metrics_prom)
+            for exam_name, sink_links in links.items():
+                print(f"[Main] Total links for '{exam_name or search_string or 'all exams'}': {len(sink_links)}")
 
             print(f"[Main] Preparing to write Excel files...")
-            write_grouped_links_to_excels(links)
+            write_grouped_links_to_excels(links, fmt=args.format, workers=args.workers)
+            if journal is not None and not scraper.failed_pages:
+                journal.finish()
+            elif journal is not None:
+                print(f"[Main] {len(scraper.failed_pages)} pages failed; rerun with --resume to fetch only those.")
+            elif scraper.failed_pages:
+                print("[Main] The incremental walk failed; the files only hold previously indexed links.")
 
             print("[Main] Scraping and file writing complete. ✅")
         else:
@@ -146,5 +418,18 @@ def main():
         print("[Main] No discussion pages found. Please check the provider name.")
 
 
+def main():
+    args = parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(message)s")
+    print("========== ExamTopics Discussion Scraper ==========")
+    provider = input("Enter provider name (e.g., google, aws, etc.): ")
+    scraper = Scraper(provider, engine=args.engine, cache_dir=args.cache_dir, offline=args.offline,
+                      concurrency=args.concurrency, parser=args.parser, cache_fresh_for=args.cache_fresh_for)
+    try:
+        run(args, scraper, provider)
+    finally:
+        scraper.close()
+
+
 if __name__ == "__main__":
     main()
@@ -1,32 +1,64 @@
 import csv
-import time
-import json
-import re
+import threading
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from docx import Document
+from selenium.common.exceptions import ElementNotInteractableException, NoSuchElementException, TimeoutException
+from browser_profiles import apply_lean_options, enable_request_blocking, worker_profile_dir
+from dedup import QuestionDeduper, dedup_urls
+from driver_pool import DriverPool
+from html_archive import HtmlArchive
+from jsonl_writer import JsonlWriter, jsonl_to_json
+from question_store import QuestionStore
+from link_records import parse_link
+from question_records import build_question_json, correct_option_letters, heading_numbers, question_heading
+from render_docx import render_with_xml_template
+from static_extractor import StaticParseError, build_static_session, fetch_question_html, parse_question_html
 
 # File paths
 CSV_PATH = "./az-104.csv"
 WORD_DOC_PATH = "Azure Administrator Associate.docx"
 JSON_PATH = "Azure Administrator Associate.json"
+JSONL_PATH = "Azure Administrator Associate.jsonl"
+WORD_TITLE = "Azure Administrator Associate Actual Exam Questions"
 EDGEDRIVER_PATH = "./msedgedriver.exe"
+EXAM_ID = "azure-administrator-associate"
+DRIVER_POOL_SIZE = 4
+DRIVER_RECYCLE_AFTER = 50
+QUESTION_REGISTRY_PATH = "question_registry.json"
+STORE_PATH = "questions.sqlite"
+ARCHIVE_DIR = ".question_archive"  # raw pages, for offline re-extraction with reparse.py
+LEAN_PROFILE = True  # block images/fonts/ads, eager page loads, persistent profile cache
 
 # Initialize output
-json_data = []
-doc = Document()
-doc.add_heading("Azure Administrator Associate Actual Exam Questions", 0)
+deduper = QuestionDeduper(QUESTION_REGISTRY_PATH)
+_archive = None
+_archive_lock = threading.Lock()
+
+# Open the raw-page archive on first use
+def get_archive():
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = HtmlArchive(ARCHIVE_DIR)
+        return _archive
 
 # Setup Edge WebDriver
-def setup_driver():
+def setup_driver(headless=False, lean=LEAN_PROFILE):
     options = EdgeOptions()
     options.add_argument("--disable-blink-features=AutomationControlled")
+    if headless:
+        options.add_argument("--headless=new")
+    if lean:
+        apply_lean_options(options, profile_dir=worker_profile_dir())
     service = EdgeService(EDGEDRIVER_PATH)
-    return webdriver.Edge(service=service, options=options)
+    driver = webdriver.Edge(service=service, options=options)
+    if lean:
+        enable_request_blocking(driver)
+    return driver
 
 # Read URLs from CSV
 def read_urls(csv_path):
@@ -45,8 +77,12 @@ def dismiss_popup(driver):
     except:
         pass  # Popup not present
 
-# Extract data from question page
-def extract_question_data(driver, url, index):
+# Read the raw question fields from a page in the browser
+def extract_question_fields(driver, url, index, exam_id=EXAM_ID):
+    """Return (question_number, question_text, options_text, answer_text), or None if the page has no question.
+
+    A crashed or unresponsive driver raises WebDriverException so the pool can replace it.
+    """
     try:
         driver.get(url)
         dismiss_popup(driver)
@@ -55,80 +91,137 @@ def extract_question_data(driver, url, index):
             EC.presence_of_element_located((By.CLASS_NAME, 'discussion-header-container'))
         )
 
-        question_number = question_section.find_element(By.CSS_SELECTOR, '.question-discussion-header div').text.split('\n')[0]
+        question_number = question_heading(question_section.find_element(By.CSS_SELECTOR, '.question-discussion-header div').text)
         question_text = question_section.find_element(By.CLASS_NAME, 'question-body').find_element(By.TAG_NAME, 'p').text
         options_elements = question_section.find_elements(By.CSS_SELECTOR, '.question-choices-container li')
         options_text = [opt.text for opt in options_elements]
+    except (TimeoutException, NoSuchElementException) as e:
+        print(f"[{index}] Error scraping URL: {url}\nError: {e}")
+        return None
 
-        # Click 'Show Suggested Answer' if available
-        try:
-            show_answer_btn = question_section.find_element(By.CLASS_NAME, "reveal-solution")
-            show_answer_btn.click()
-            time.sleep(1)
-        except:
-            pass  # No reveal button
-
-        try:
-            answer_text = question_section.find_element(By.CLASS_NAME, 'correct-answer').text.strip()
-        except:
-            answer_text = "Not found"
-
-        # Extract correct option letters using regex
-        correct_option_letters = re.findall(r'[A-Z]', answer_text.split(":")[-1].strip().upper())
-
-        # Add to Word Document
-        doc.add_paragraph(question_number, style='Heading 2')
-        doc.add_paragraph(f"Q: {question_text}")
-        for opt in options_text:
-            opt_id = opt[0]
-            p = doc.add_paragraph(style='List Bullet')
-            run = p.add_run(opt)
-            if opt_id in correct_option_letters:
-                run.bold = True
-        doc.add_paragraph(f"Answer: {' '.join(correct_option_letters)}")
-
-        # Add to JSON
-        options_json = []
-        for opt in options_text:
-            opt_id = opt[0]
-            clean_text = opt[3:].strip()
-            options_json.append({
-                "id": opt_id,
-                "isCorrect": opt_id in correct_option_letters,
-                "text": clean_text
-            })
-
-        question_json = {
-            "text": question_text,
-            "examId": "azure-administrator-associate",
-            "id": "",
-            "options": options_json,
-            "explanation": ""
-        }
-        return question_json
+    # Click 'Show Suggested Answer' if available, then wait for the answer to show
+    try:
+        show_answer_btn = question_section.find_element(By.CLASS_NAME, "reveal-solution")
+        show_answer_btn.click()
+        WebDriverWait(driver, 5).until(
+            EC.visibility_of_element_located((By.CLASS_NAME, 'correct-answer'))
+        )
+    except (TimeoutException, NoSuchElementException, ElementNotInteractableException):
+        pass  # No reveal button
 
+    try:
+        answer_text = question_section.find_element(By.CLASS_NAME, 'correct-answer').text.strip()
+    except NoSuchElementException:
+        answer_text = "Not found"
+    get_archive().put(url, exam_id, driver.page_source, source="browser")
+
+    return question_number, question_text, options_text, answer_text
+
+# Build one question's JSON record from its fields (None for a duplicate)
+def record_question(fields, exam_id=EXAM_ID, url=None):
+    question_number, question_text, options_text, answer_text = fields
+
+    # Extract correct option letters using regex
+    correct_letters = correct_option_letters(answer_text)
+
+    # Number and topic come from the page heading; older stored headings lack the topic, the URL has both
+    question, topic = heading_numbers(question_number)
+    link = parse_link(url) if url else None
+    if link is not None:
+        question = question if question is not None else link.question
+        topic = topic if topic is not None else link.topic
+
+    question_json = build_question_json(question_text, options_text, correct_letters, exam_id, question, topic)
+    if not deduper.add(question_json):
+        return None
+    return question_json
+
+# Extract data from question page
+def extract_question_data(driver, url, index):
+    try:
+        fields = extract_question_fields(driver, url, index)
     except Exception as e:
         print(f"[{index}] Error scraping URL: {url}\nError: {e}")
         return None
+    return record_question(fields, url=url) if fields else None
 
-# Main script
-def main():
-    driver = setup_driver()
-    urls = read_urls(CSV_PATH)
+# Extract data from the served HTML, without a browser
+def extract_question_fields_static(session, url, index, exam_id=EXAM_ID):
+    try:
+        html = fetch_question_html(session, url)
+        get_archive().put(url, exam_id, html)
+        return parse_question_html(html)
+    except StaticParseError as e:
+        print(f"[{index}] Static parse failed ({e}), falling back to browser")
+        return None
+    except Exception as e:
+        print(f"[{index}] Static fetch failed ({e}), falling back to browser")
+        return None
 
+# Scrape into the store: static HTML first, headless browsers for what it can't parse
+def scrape_to_store(store, urls, exam_id=EXAM_ID):
+    session = build_static_session()
+    fallback = []
     for idx, url in enumerate(urls, start=2):
         print(f"[{idx}] Scraping: {url}")
-        data = extract_question_data(driver, url, idx)
-        if data:
-            json_data.append(data)
-        time.sleep(1)
+        fields = extract_question_fields_static(session, url, idx, exam_id)
+        if fields:
+            store.save_fields(url, exam_id, fields)
+        else:
+            fallback.append((idx, url))
+
+    scrape_in_browsers(store, [(idx, url, exam_id) for idx, url in fallback])
+
+# Scrape (index, url, exam_id) items the static parser couldn't handle on a pool of headless browsers
+def scrape_in_browsers(store, items, size=DRIVER_POOL_SIZE):
+    if not items:
+        return
+    print(f"Falling back to {size} browsers for {len(items)} pages...")
+
+    def scrape_in_browser(driver, item):
+        idx, url, exam_id = item
+        fields = extract_question_fields(driver, url, idx, exam_id)
+        return fields, None if fields else "no question found in browser"
+
+    pool = DriverPool(lambda: setup_driver(headless=True), size=size, recycle_after=DRIVER_RECYCLE_AFTER)
+    results = pool.map(scrape_in_browser, items)
+    # The pool returns None for pages whose driver crashed on every attempt
+    for (idx, url, exam_id), result in zip(items, results):
+        fields, reason = result or (None, "browser crashed on every attempt")
+        if fields:
+            store.save_fields(url, exam_id, fields)
+        else:
+            store.save_failure(url, exam_id, reason)
+
+# Generate the Word and JSON outputs from the store, in CSV order
+def export_from_store(store, urls, exam_id=EXAM_ID, json_path=JSON_PATH, jsonl_path=JSONL_PATH,
+                      doc_path=WORD_DOC_PATH, title=WORD_TITLE):
+    # Records stream to JSON Lines as they are built, then convert to the pretty JSON array
+    items = []
+    with JsonlWriter(jsonl_path) as writer:
+        for url, fields in store.fields_for(urls):
+            record = record_question(fields, exam_id, url)
+            if record:
+                writer.write(record)
+                items.append((fields[0], record))
+
+    render_with_xml_template(items, doc_path, title)
+    return jsonl_to_json(jsonl_path, json_path)
+
+# Main script
+def main():
+    store = QuestionStore(STORE_PATH)
+    urls = dedup_urls(read_urls(CSV_PATH))
+
+    todo = store.pending(urls)
+    print(f"{len(urls) - len(todo)} questions already in {STORE_PATH}, {len(todo)} to scrape.")
+    scrape_to_store(store, todo)
+    print(f"Store status for {EXAM_ID}: {store.status_counts(EXAM_ID)}")
 
-    # Save output files
-    doc.save(WORD_DOC_PATH)
-    with open(JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(json_data, f, indent=4, ensure_ascii=False)
+    export_from_store(store, urls)
+    deduper.save()
+    store.close()
 
-    driver.quit()
     print("✅ Scraping completed and files saved.")
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 import docx
-import re
 from docx import Document
+from docx.oxml.ns import qn
+
+from question_index import QUESTION_PATTERN, QuestionIndex, paragraph_element_text, question_entries
 
 
 def extract_questions(doc_path):
@@ -10,11 +12,8 @@ def extract_questions(doc_path):
     current_question_num = None
     current_content = []
 
-    # Pattern to match "Question #: X" where X is a number
-    pattern = re.compile(r'Question\s+#:\s+(\d+)')
-
     for para in doc.paragraphs:
-        match = pattern.match(para.text.strip())
+        match = QUESTION_PATTERN.match(para.text.strip())
         if match:
             # If we already have a question, save it before starting a new one
             if current_question_num is not None:
@@ -79,12 +78,67 @@ def create_sorted_document(questions, output_path):
     new_doc.save(output_path)
 
 
-def sort_questions_in_word_doc(input_path, output_path):
-    """Main function to sort questions in a Word document."""
-    questions = extract_questions(input_path)
-    create_sorted_document(questions, output_path)
+def extract_question_elements(doc):
+    """Split the document body into (preamble, [(number, elements)], sectPr) in one pass.
+
+    Every body element is kept: tables, images and anything else between two
+    headings belongs to the question above it.
+    """
+    preamble = []
+    questions = []
+    sect_pr = None
+    current = preamble
+    for element in doc.element.body.iterchildren():
+        if element.tag == qn('w:sectPr'):
+            sect_pr = element
+            continue
+        if element.tag == qn('w:p'):
+            match = QUESTION_PATTERN.match(paragraph_element_text(element).strip())
+            if match:
+                current = [element]
+                questions.append((int(match.group(1)), current))
+                continue
+        current.append(element)
+    return preamble, questions, sect_pr
+
+
+def create_sorted_document_xml(input_path, output_path):
+    """Sort questions by moving the body's XML elements into order.
+
+    The source package is reused, so styles, numbering, images and hyperlinks
+    survive unchanged. The sorted document's question index is saved alongside
+    it. Returns the number of questions.
+    """
+    doc = Document(input_path)
+    preamble, questions, sect_pr = extract_question_elements(doc)
+    body = doc.element.body
+    # Appending an element that is already in the body moves it
+    for element in preamble:
+        body.append(element)
+    for _, elements in sorted(questions, key=lambda x: x[0]):
+        for element in elements:
+            body.append(element)
+    if sect_pr is not None:
+        body.append(sect_pr)
+    doc.save(output_path)
+    QuestionIndex(output_path, question_entries(list(body.iterchildren()))).save()
+    return len(questions)
+
+
+def sort_questions_in_word_doc(input_path, output_path, mode="xml"):
+    """Main function to sort questions in a Word document.
+
+    ``mode="xml"`` reorders the document's own XML (fast and lossless);
+    ``mode="copy"`` rebuilds a new document paragraph by paragraph.
+    """
+    if mode == "xml":
+        count = create_sorted_document_xml(input_path, output_path)
+    else:
+        questions = extract_questions(input_path)
+        create_sorted_document(questions, output_path)
+        count = len(questions)
     print(f"Sorted document saved to {output_path}")
-    print(f"Sorted {len(questions)} questions in ascending order.")
+    print(f"Sorted {count} questions in ascending order.")
 
 
 # Usage
@@ -0,0 +1,71 @@
+import requests
+from bs4 import BeautifulSoup
+
+from question_records import question_heading
+from transport import configure_session
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36 Edg/124.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class StaticParseError(Exception):
+    """The served HTML does not contain a parseable question (needs the browser)."""
+
+
+def build_static_session(pool_size=4):
+    session = configure_session(requests.Session(), pool_size=pool_size)
+    session.headers.update(BROWSER_HEADERS)
+    return session
+
+
+def _text(element):
+    """Approximate Selenium's .text: <br> becomes a newline, whitespace is collapsed per line."""
+    for br in element.find_all("br"):
+        br.replace_with("\n")
+    lines = (" ".join(line.split()) for line in element.get_text().split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def parse_question_html(html):
+    """Extract (question_number, question_text, options_text, answer_text) from a question page.
+
+    The question, choices and suggested answer are all in the served HTML; the
+    answer is merely hidden until 'reveal-solution' is clicked.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    section = soup.select_one(".discussion-header-container")
+    if section is None:
+        raise StaticParseError("no .discussion-header-container in page")
+
+    header = section.select_one(".question-discussion-header div")
+    body = section.select_one(".question-body p")
+    if header is None or body is None:
+        raise StaticParseError("question header or body missing")
+    question_number = question_heading(_text(header))
+    question_text = _text(body)
+
+    options_text = []
+    for li in section.select(".question-choices-container li"):
+        for badge in li.select(".most-voted-answer-badge"):
+            badge.decompose()
+        options_text.append(" ".join(_text(li).split()))
+
+    answer = section.select_one(".correct-answer")
+    answer_text = _text(answer).strip() if answer is not None else "Not found"
+    return question_number, question_text, options_text, answer_text
+
+
+def fetch_question_html(session, url, timeout=(5, 30)):
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
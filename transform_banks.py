@@ -0,0 +1,121 @@
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from jsonl_writer import iter_json_array, write_json_records
+
+# Example rules file (applied in order to every record):
+# [
+#     {"where": {"examId": "profession-database-engineer"},
+#      "set": {"examId": "professional-cloud-database-engineer"}},
+#     {"where": {"text": "Question not found."}, "drop": true}
+# ]
+# "where" matches top-level fields by equality (an empty or missing "where"
+# matches every record), "set" assigns fields, "drop" removes the record.
+
+
+def load_rules(args):
+    """Merge the rules file (if any) with the --rewrite/--drop shorthands."""
+    rules = []
+    if args.rules:
+        with open(args.rules, encoding="utf-8") as f:
+            rules = json.load(f)
+    for field, old, new in args.rewrite or []:
+        rules.append({"where": {field: old}, "set": {field: new}})
+    for spec in args.drop or []:
+        field, _, value = spec.partition("=")
+        rules.append({"where": {field: value}, "drop": True})
+    return rules
+
+
+def apply_rules(record, rules):
+    """Return (record or None if dropped, changed)."""
+    changed = False
+    for rule in rules:
+        if any(record.get(field) != value for field, value in rule.get("where", {}).items()):
+            continue
+        if rule.get("drop"):
+            return None, True
+        for field, value in rule.get("set", {}).items():
+            if record.get(field) != value:
+                record[field] = value
+                changed = True
+    return record, changed
+
+
+def transform_file(path, rules, dry_run=False):
+    """Stream one bank through the rules into a temp file; replace the bank only if a record changed.
+
+    Returns a stats dict; files that are not a JSON array are reported as skipped.
+    """
+    stats = {"path": path, "records": 0, "changed": 0, "dropped": 0, "skipped": None}
+
+    def transformed():
+        for record in iter_json_array(path):
+            stats["records"] += 1
+            record, changed = apply_rules(record, rules)
+            if record is None:
+                stats["dropped"] += 1
+                continue
+            stats["changed"] += changed
+            yield record
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            write_json_records(transformed(), out)
+    except ValueError as e:
+        stats["skipped"] = str(e)
+    if stats["skipped"] or dry_run or not (stats["changed"] or stats["dropped"]):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+    return stats
+
+
+def transform_banks(paths, rules, workers=None, dry_run=False):
+    """Transform many banks in parallel, one file per worker process."""
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(transform_file, path, rules, dry_run) for path in paths]
+        for future in as_completed(futures):
+            stats = future.result()
+            results.append(stats)
+            if stats["skipped"]:
+                print(f"[Transform] Skipped {stats['path']}: {stats['skipped']}")
+            elif stats["changed"] or stats["dropped"]:
+                action = "would update" if dry_run else "updated"
+                print(f"[Transform] {stats['path']}: {action} {stats['changed']} and dropped "
+                      f"{stats['dropped']} of {stats['records']} records.")
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Apply declarative rewrites and filters to question JSON banks")
+    parser.add_argument("banks", nargs="*", help="Bank .json files (default: every *.json here)")
+    parser.add_argument("--rules", help="JSON list of {where, set, drop} rules")
+    parser.add_argument("--rewrite", nargs=3, action="append", metavar=("FIELD", "OLD", "NEW"),
+                        help="Set FIELD to NEW where it equals OLD (repeatable)")
+    parser.add_argument("--drop", action="append", metavar="FIELD=VALUE",
+                        help="Drop records whose FIELD equals VALUE (repeatable)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rules = load_rules(args)
+    if not rules:
+        print("[Transform] No rules given; use --rules, --rewrite or --drop.")
+        return
+    banks = args.banks or sorted(glob.glob("*.json"))
+    results = transform_banks(banks, rules, workers=args.workers, dry_run=args.dry_run)
+    touched = sum(1 for stats in results if stats["changed"] or stats["dropped"])
+    print(f"[Transform] {touched} of {len(banks)} files {'would change' if args.dry_run else 'changed'}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default (connect, read) timeout to every request."""
+
+    def __init__(self, *args, timeout=(5, 30), **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def configure_session(session, pool_size=10, retries=4, backoff=0.5, timeout=(5, 30)):
+    """Mount a pooled, retrying, time-limited adapter on a requests session.
+
+    The connection pool is sized to the crawl concurrency, and retries use
+    jittered exponential backoff that honours Retry-After on 429/503.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        backoff_jitter=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+    )
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry, timeout=timeout
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class CircuitBreaker:
+    """Pause every worker when the recent error rate spikes.
+
+    The breaker watches the last ``window`` outcomes. Once at least ``min_calls``
+    have been seen and the failure ratio reaches ``threshold``, it opens for
+    ``cooldown`` seconds; callers of ``wait()`` block until it closes again.
+    """
+
+    def __init__(self, window=50, min_calls=10, threshold=0.5, cooldown=60):
+        self.window = window
+        self.min_calls = min_calls
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.open_until = 0.0
+        self.trips = 0
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def remaining_pause(self):
+        return max(0.0, self.open_until - time.monotonic())
+
+    def wait(self):
+        pause = self.remaining_pause()
+        if pause:
+            time.sleep(pause)
+
+    def record(self, success):
+        with self._lock:
+            self._outcomes.append(success)
+            if len(self._outcomes) < self.min_calls or self.remaining_pause():
+                return
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.threshold:
+                self.open_until = time.monotonic() + self.cooldown
+                self.trips += 1
+                self._outcomes.clear()
+                print(f"[Circuit Breaker] {failures} recent failures, pausing crawl for {self.cooldown}s.")
+
+
+class HostRateLimiter:
+    """Token bucket per host, shared by every worker that talks to that host."""
+
+    def __init__(self, rate=5.0, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlsplit(url).netloc
+        while True:
+            with self._lock:
+                tokens, updated = self._buckets.get(host, (self.burst, time.monotonic()))
+                now = time.monotonic()
+                tokens = min(self.burst, tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                delay = (1 - tokens) / self.rate
+            time.sleep(delay)